@@ -0,0 +1,106 @@
+import os
+import mmap
+import shutil
+import hashlib
+import tempfile
+import threading
+
+# --- STATIC SERVING ---
+# Streamlit serves files under ./static at app/static/ when
+# server.enableStaticServing is on (see .streamlit/config.toml), as plain
+# HTTP downloads instead of bytes pushed over the websocket. The response
+# carries an ETag and Last-Modified but no max-age, so how long the
+# browser keeps a sound is its own heuristic; the "?v=" content hash only
+# makes sure a changed file is never served from a stale cache.
+STATIC_DIR = "static"
+# Leading slash: st.audio passes /app/static/ URLs through untouched
+STATIC_URL_PREFIX = "/app/static"
+
+# Files larger than this are memory-mapped instead of copied into the heap
+MMAP_THRESHOLD = 256 * 1024
+
+
+class SoundAsset:
+    """One sound file, loaded once per process and shared read-only."""
+
+    __slots__ = ("path", "data", "etag", "url")
+
+    def __init__(self, path, data, etag, url):
+        self.path = path
+        self.data = data
+        self.etag = etag
+        self.url = url
+
+    def as_bytes(self):
+        return self.data if isinstance(self.data, bytes) else bytes(self.data)
+
+
+def _resolve(path):
+    """Where to serve ``path`` from: a copy under ./static, made on first use.
+
+    Sounds are dropped in ``sounds/``; copying them next to the static
+    route is what lets the browser fetch them by URL. When the copy cannot
+    be written (read-only checkout) the sound is played from memory.
+    """
+    static_path = os.path.join(STATIC_DIR, path)
+    if not os.path.exists(static_path) and os.path.exists(path):
+        tmp = None
+        try:
+            directory = os.path.dirname(static_path)
+            os.makedirs(directory, exist_ok=True)
+            # Written aside and renamed, so another worker never serves half a file
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            os.close(fd)
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, static_path)
+        except OSError:
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return path, False
+    if os.path.exists(static_path):
+        return static_path, True
+    return path, False
+
+
+def _load(path):
+    resolved, is_static = _resolve(path)
+    if not os.path.exists(resolved):
+        return None
+
+    with open(resolved, "rb") as f:
+        if os.path.getsize(resolved) > MMAP_THRESHOLD:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
+
+    etag = hashlib.sha1(data).hexdigest()[:16]
+    url = None
+    if is_static:
+        rel = os.path.relpath(resolved, STATIC_DIR).replace(os.sep, "/")
+        url = f"{STATIC_URL_PREFIX}/{rel}?v={etag}"
+    return SoundAsset(resolved, data, etag, url)
+
+
+class SoundLibrary:
+    """Every game sound, read from disk once and then served from memory."""
+
+    def __init__(self, paths):
+        self._assets = {path: _load(path) for path in paths}
+
+    def get(self, path):
+        """Returns the cached asset for ``path`` or ``None`` if it is missing."""
+        return self._assets.get(path)
+
+
+_libraries = {}
+_lock = threading.Lock()
+
+
+def get_sound_library(sounds):
+    """Process-wide library for a ``{name: path}`` mapping such as SOUNDS."""
+    key = tuple(sorted(sounds.values()))
+    with _lock:
+        library = _libraries.get(key)
+        if library is None:
+            library = _libraries[key] = SoundLibrary(key)
+    return library
@@ -0,0 +1,97 @@
+import random
+
+# --- OUTCOME CODES ---
+TOO_LOW = -1
+EXACT = 0
+TOO_HIGH = 1
+
+# --- CLOSENESS BANDS ---
+# A guess within BANDS[i] of the secret lands in band i; anything further
+# away is COLD (== len(bands)).
+BANDS = (5, 10, 20)
+BAND_NAMES = ("fire", "warm", "lukewarm", "cold")
+COLD = len(BANDS)
+
+
+class GuessEngine:
+    """Streamlit-free rules of Guess the Hidden Number.
+
+    State is a handful of ints in ``__slots__``; the secret comes from a
+    private ``random.Random`` so a seed reproduces every round.
+    """
+
+    __slots__ = (
+        "min_num", "max_num", "max_attempts", "bands",
+        "secret", "attempts", "won", "last_guess", "_rng",
+    )
+
+    def __init__(self, min_num=1, max_num=100, max_attempts=5, bands=BANDS, seed=None):
+        self.min_num = min_num
+        self.max_num = max_num
+        self.max_attempts = max_attempts
+        self.bands = tuple(bands)
+        self._rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Starts a new round with a fresh secret."""
+        # random() is several times cheaper than randint() in tight loops
+        span = self.max_num - self.min_num + 1
+        self.secret = self.min_num + int(self._rng.random() * span)
+        self.attempts = 0
+        self.won = False
+        self.last_guess = None
+
+    # ----- compact state (see common.session) -----
+    def to_state(self):
+        return [
+            self.min_num, self.max_num, self.max_attempts, list(self.bands),
+            self.secret, self.attempts, int(self.won), self.last_guess,
+        ]
+
+    @classmethod
+    def from_state(cls, state):
+        min_num, max_num, max_attempts, bands, secret, attempts, won, last_guess = state
+        engine = cls(min_num, max_num, max_attempts, bands)
+        engine.secret = secret
+        engine.attempts = attempts
+        engine.won = bool(won)
+        engine.last_guess = last_guess
+        return engine
+
+    @property
+    def lost(self):
+        return not self.won and self.attempts >= self.max_attempts
+
+    @property
+    def finished(self):
+        return self.won or self.attempts >= self.max_attempts
+
+    @property
+    def attempts_left(self):
+        return max(0, self.max_attempts - self.attempts)
+
+    def guess(self, value):
+        """Scores one guess and returns ``(direction, band)``.
+
+        ``direction`` is TOO_LOW, EXACT or TOO_HIGH; ``band`` indexes
+        BAND_NAMES (0 for an exact hit).
+        """
+        if self.won or self.attempts >= self.max_attempts:
+            raise ValueError("The round is over; call reset() first")
+
+        self.attempts += 1
+        self.last_guess = value
+
+        diff = value - self.secret
+        if diff == 0:
+            self.won = True
+            return EXACT, 0
+
+        direction = TOO_HIGH if diff > 0 else TOO_LOW
+        if diff < 0:
+            diff = -diff
+        for band, limit in enumerate(self.bands):
+            if diff <= limit:
+                return direction, band
+        return direction, len(self.bands)
@@ -1,11 +1,18 @@
 import streamlit as st
-import random
-import time
 import os 
 from collections import deque # Using deque for efficient append/pop (if max history is set)
 
+from common.events import emit
+from common.leaderboard import get_leaderboard
+from common.metrics import span, timed
+from common.session import persist_session
+from common.ui import is_fragment_rerun, rerun_fragment
+from Guess_Number.assets import get_sound_library
+from Guess_Number.engine import BANDS, EXACT, TOO_LOW, GuessEngine
+
 # --- LOCAL SOUND FILE PATHS ---
 # Ensure these files exist in a directory named 'sounds' relative to your main app file.
+# Copies under 'static/sounds' are preferred: browsers then fetch them once by URL.
 SOUNDS = {
     "win": "sounds/win.mp3",
     "fire": "sounds/fire.mp3",
@@ -15,252 +22,339 @@ SOUNDS = {
     "lose": "sounds/lose.mp3",
 }
 
+# --- CLOSENESS MESSAGES (one per engine band, coldest last) ---
+# (text, detail, sound)
+CLOSENESS = (
+    (":green[🔥🔥 On Fire!]", "Extremely close! Diff between guess and secret number is {limit} digits", "fire"),
+    (":green[✅ Getting HOT!]", "Very close! Diff between guess and secret number is {limit} digits", "warm"),
+    ("orange[🟡 Lukewarm.]", "Getting closer. Diff between guess and secret number is {limit} digits", "lukewarm"),
+    (":red[🥶 BRRR! It's FREEZING!]", "Far away. Try a big change.", "cold"),
+)
+
+# --- REVEAL ANIMATION ---
+# Seconds the "checking guess" animation plays in the browser before the
+# result fades in. Runs client-side only; set to 0 for load tests.
+GN_REVEAL_DELAY = float(os.getenv("GN_REVEAL_DELAY", "1.2"))
+
 # --- HISTORY CONSTANT ---
 # Define how many past guesses to display (optional, but good practice)
 MAX_HISTORY_DISPLAY = 10 
 
 
+# --- HISTORY ENTRIES ---
+# Kept as compact (attempt, guess, direction, band) tuples in a bounded
+# deque; the table strings are built only for the rows on screen.
+def new_history(entries=()):
+    return deque((tuple(e) for e in entries), maxlen=MAX_HISTORY_DISPLAY)
+
+
+def _closeness(band, bands):
+    """(text, detail, sound) of the CLOSENESS row for an engine band."""
+    if band < len(bands):
+        text, detail, sound = CLOSENESS[min(band, len(CLOSENESS) - 2)]
+        return text, detail.format(limit=bands[band]), sound
+    return CLOSENESS[-1]
+
+
+def _history_rows(history, engine):
+    rows = []
+    for attempt, guess, direction, band in history:
+        if direction == EXACT:
+            result, closeness = "🎉 **WIN**", "Exact Match!"
+        else:
+            result = "📉 Too low" if direction == TOO_LOW else "📈 Too high"
+            closeness = _closeness(band, engine.bands)[0]
+            closeness = closeness.replace(':', '').replace('[', '').replace(']', '')
+        rows.append({"Attempt": attempt, "Guess": guess, "Result": result, "Closeness": closeness})
+
+    if rows and engine.lost:
+        # Final loss entry in history
+        rows[-1]["Result"] = f"❌ **LOSE** (Actual: {engine.secret})"
+    return rows
+
+
 class GuessTheNumber:
-    def __init__(self, min_num=1, max_num=100, max_attempts=5):
+    """Streamlit view over a headless GuessEngine kept in session state."""
+
+    def __init__(self, min_num=1, max_num=100, max_attempts=5, reveal_delay=GN_REVEAL_DELAY,
+                 bands=BANDS, seed=None):
         """Initializes the game parameters and sets up session state."""
         self.min_num = min_num
         self.max_num = max_num
         self.max_attempts = max_attempts
+        self.reveal_delay = reveal_delay
+        self.bands = tuple(bands)
 
         # --- INITIALIZE ALL SESSION STATE KEYS ---
-        if "gn_number" not in st.session_state:
+        # The engine owns the rules state (secret, attempts, win)
+        if "gn_engine" not in st.session_state:
+            st.session_state.gn_engine = GuessEngine(
+                min_num, max_num, max_attempts, self.bands, seed=seed
+            )
             self.reset_game()
         
-        if "gn_attempts" not in st.session_state:
-            st.session_state.gn_attempts = 0
-        if "gn_won" not in st.session_state:
-            st.session_state.gn_won = False
         if "gn_feedback" not in st.session_state:
             st.session_state.gn_feedback = ""
         
         if "gn_input_value" not in st.session_state:
             st.session_state.gn_input_value = self.min_num
-        if "gn_last_guess" not in st.session_state:
-            st.session_state.gn_last_guess = None
             
         # 1. New History Key
         if "gn_history" not in st.session_state:
-            st.session_state.gn_history = [] 
+            st.session_state.gn_history = new_history()
             
         # Sound control key (stores the local path)
         if "gn_sound_path" not in st.session_state:
             st.session_state.gn_sound_path = None 
+
+        # Set by each guess so only a fresh result plays the reveal animation
+        if "gn_reveal_pending" not in st.session_state:
+            st.session_state.gn_reveal_pending = False
         
         # Audio Path Cleanup (from prior versions)
         if "gn_sound_url" in st.session_state:
              st.session_state.gn_sound_path = st.session_state.gn_sound_url
              del st.session_state.gn_sound_url 
 
+    @property
+    def engine(self):
+        return st.session_state.gn_engine
+
     def reset_game(self):
         """Resets all game state variables for a new round."""
-        st.session_state.gn_number = random.randint(self.min_num, self.max_num)
-        st.session_state.gn_attempts = 0
-        st.session_state.gn_won = False
+        self.engine.reset()
         st.session_state.gn_feedback = ""
         st.session_state.gn_input_value = self.min_num
-        st.session_state.gn_last_guess = None
         st.session_state.gn_sound_path = None 
+        st.session_state.gn_reveal_pending = False
         # 3. Clear History
-        st.session_state.gn_history = []
+        st.session_state.gn_history = new_history()
+
+    def _render_reveal(self):
+        """Plays the "checking guess" suspense in the browser, not on the server."""
+        if not st.session_state.gn_reveal_pending:
+            return
+        st.session_state.gn_reveal_pending = False
+
+        if self.reveal_delay <= 0:
+            return
+
+        delay = self.reveal_delay
+        st.markdown(
+            f"""
+            <style>
+            @keyframes gn-reveal {{ from {{ opacity: 0; }} to {{ opacity: 1; }} }}
+            @keyframes gn-checking {{ 0%, 90% {{ opacity: 1; }} 100% {{ opacity: 0; height: 0; }} }}
+            .st-key-gn_status, .st-key-gn_result {{
+                opacity: 0; animation: gn-reveal 0.3s ease-out {delay:.2f}s forwards;
+            }}
+            /* Balloons wait off-screen until the reveal, still staggered */
+            .st-key-gn_result .stBalloons img {{ animation-delay: {delay:.2f}s !important; }}
+            .st-key-gn_result .stBalloons img:nth-child(3n+1) {{ animation-delay: {delay + 0.3:.2f}s !important; }}
+            .st-key-gn_result .stBalloons img:nth-child(3n+2) {{ animation-delay: {delay + 0.6:.2f}s !important; }}
+            .gn-checking {{ overflow: hidden; animation: gn-checking {delay:.2f}s linear forwards; }}
+            </style>
+            <div class="gn-checking">🔍 Checking guess: {self.engine.last_guess}...</div>
+            """,
+            unsafe_allow_html=True,
+        )
 
     def play(self):
-        """Renders the Streamlit UI for the game, including guess processing logic."""
+        """Renders the game: the interactive board as a fragment, then the static rules.
+
+        Guesses and resets rerun only the board fragment; the rest of the
+        page (auth, sidebar, rules) is rendered once per full script run.
+        """
+        st.fragment(self.render_board)()
+
+        st.divider()
+        self.render_rules()
+
+    def render_rules(self):
+        """Static hint legend; does not change between guesses."""
+        # ===== HINT RULES (USER VISIBLE) - Simplified =====
+        st.markdown("ℹ️ **Closeness Meter Rules**")
+        fire, hot, lukewarm = self.bands[:3]
+        st.markdown(
+                f"""
+                *Use the direction arrows and the color of the hint to guide your next guess!*
+                
+                **Direction**
+                - 📉 **Too low** (Guess is smaller)
+                - 📈 **Too high** (Guess is larger)
+                
+                **Temperature (How Close You Are - based on $ |Guess - Actual| $ )**
+                - :green[🔥🔥 On Fire!] → Extremely close! Difference between guess and secret number is {fire} digits 
+                - :green[✅ Getting HOT!] → Very close! Difference between guess and secret number is {hot} digits 
+                - :orange[🟡 Lukewarm.] → Getting closer, Difference between guess and secret number is {lukewarm} digits 
+                - :red[🥶 BRRR! It's FREEZING!] → Far away, try a big change.
+                """
+            )
+
+    @timed("guess.board")
+    def render_board(self):
+        """Renders the interactive part of the game, including guess processing logic."""
         
         # --- INNER FUNCTION TO PROCESS GUESS ---
         def _process_guess():
             """Handles the game logic when the submit button is clicked."""
             
             guess = st.session_state["gn_input_value"] 
-            
-            st.session_state.gn_attempts += 1
-            current_attempt = st.session_state.gn_attempts
+            engine = self.engine
+
+            direction, band = engine.guess(guess)
+            current_attempt = engine.attempts
             st.session_state.gn_feedback = ""
-            st.session_state.gn_last_guess = guess
             st.session_state.gn_sound_path = None 
 
             st.session_state.gn_input_value = self.min_num 
 
-            with st.status(f"🔍 Checking guess: {guess}...", expanded=False):
-                time.sleep(1.2)
+            # The "checking" suspense is animated in the browser (see _render_reveal)
+            st.session_state.gn_reveal_pending = True
+
+            emit(
+                "guess", attempt=current_attempt, direction=direction, band=band,
+                won=engine.won, lost=engine.lost,
+            )
 
             # 4. Check for Win
-            if guess == st.session_state.gn_number:
+            if direction == EXACT:
                 feedback = (
-                    f"🎉 **Perfect!** You nailed the number **{st.session_state.gn_number}** "
+                    f"🎉 **Perfect!** You nailed the number **{engine.secret}** "
                     f"in just **{current_attempt}** tries!"
                 )
                 st.session_state.gn_feedback = feedback
-                st.session_state.gn_won = True
                 st.session_state.gn_sound_path = SOUNDS["win"] 
                 
                 # 2. Append Win to History
-                st.session_state.gn_history.append({
-                    "Attempt": current_attempt,
-                    "Guess": guess,
-                    "Result": "🎉 **WIN**",
-                    "Closeness": "Exact Match!"
-                })
+                st.session_state.gn_history.append((current_attempt, guess, EXACT, band))
+
+                # Fewest guesses ranks first
+                get_leaderboard().submit(
+                    "number", st.session_state.get("player_name"),
+                    current_attempt, engine.max_attempts,
+                )
                 return
 
             # 5. Provide Hints
-            diff = abs(guess - st.session_state.gn_number)
-
-            print("Guess number is :",guess)
-            print("Secret number is :", st.session_state.gn_number)
-
-            direction = "📉 **Too low**" if guess < st.session_state.gn_number else "📈 **Too high**"
+            direction_text = "📉 **Too low**" if direction == TOO_LOW else "📈 **Too high**"
 
             # Closeness logic: More interactive and emotional language
-            if diff <= 5: 
-                closeness_text = ":green[🔥🔥 On Fire!]"
-                closeness_detail = "Extremely close! Diff between guess and secret number is 5 digits"
-                st.session_state.gn_sound_path = SOUNDS["fire"]
-            elif diff <= 10:
-                closeness_text = ":green[✅ Getting HOT!]"
-                closeness_detail = "Very close! Diff between guess and secret number is 10 digits"
-                st.session_state.gn_sound_path = SOUNDS["warm"]
-            elif diff <= 20:
-                closeness_text = "orange[🟡 Lukewarm.]"
-                closeness_detail = "Getting closer. Diff between guess and secret number is 20 digits"
-                st.session_state.gn_sound_path = SOUNDS["lukewarm"]
-            else:
-                closeness_text = ":red[🥶 BRRR! It's FREEZING!]"
-                closeness_detail = "Far away. Try a big change."
-                st.session_state.gn_sound_path = SOUNDS["cold"]
+            closeness_text, closeness_detail, sound = _closeness(band, engine.bands)
+            st.session_state.gn_sound_path = SOUNDS[sound]
                 
-            feedback = f"Your last guess ({guess}): {direction}. {closeness_text} → {closeness_detail.replace('$', '')}"
+            feedback = f"Your last guess ({guess}): {direction_text}. {closeness_text} → {closeness_detail.replace('$', '')}"
             st.session_state.gn_feedback = feedback
             
-            # 2. Append Guess to History
-            st.session_state.gn_history.append({
-                "Attempt": current_attempt,
-                "Guess": guess,
-                "Result": direction.replace('**', ''),
-                "Closeness": closeness_text.replace(':', '').replace('[', '').replace(']', '')
-            })
+            # 2. Append Guess to History (formatted only when displayed)
+            st.session_state.gn_history.append((current_attempt, guess, direction, band))
 
             # 6. Loss condition
-            if current_attempt >= self.max_attempts:
+            if engine.lost:
                 st.session_state.gn_feedback = (
                     f"😭 **Tough Luck!** You ran out of attempts.\n\n"
-                    f"The secret number was **{st.session_state.gn_number}**."
+                    f"The secret number was **{engine.secret}**."
                 )
                 st.session_state.gn_sound_path = SOUNDS["lose"]
-                # Final loss entry in history
-                st.session_state.gn_history[-1]['Result'] = f"❌ **LOSE** (Actual: {st.session_state.gn_number})"
+                # The final history entry is shown as the loss (see _history_rows)
                 
         # --- END OF INNER FUNCTION ---
 
-        attempts_left = max(0, self.max_attempts - st.session_state.gn_attempts)
-        last_guess_display = st.session_state.gn_last_guess if st.session_state.gn_last_guess is not None else 'N/A'
+        engine = self.engine
+        attempts_left = engine.attempts_left
+        last_guess_display = engine.last_guess if engine.last_guess is not None else 'N/A'
 
-        # ===== AUDIO PLAYER (LOCAL FILE HANDLER FIX) =====
-        if st.session_state.gn_sound_path and os.path.exists(st.session_state.gn_sound_path):
-            try:
-                with open(st.session_state.gn_sound_path, "rb") as audio_file:
-                    audio_bytes = audio_file.read()
-                
-                st.audio(audio_bytes, format="audio/mp3", start_time=0)
-                
-            except Exception:
-                pass
-            
-            st.session_state.gn_sound_path = None
+        # The outcome of a fresh guess (status, history, sound, result) is
+        # held back by the reveal animation until the "checking" phase ends
+        self._render_reveal()
 
+        with st.container(key="gn_status"):
+            # ===== ATTEMPTS + PROGRESS =====
+            st.markdown(
+                f"""
+                🧠 **Attempts Left:** `{attempts_left}` / `{self.max_attempts}`  
+                📏 *Range:* `{self.min_num}` → `{self.max_num}`
+                """
+            )
 
-        # ===== UI RENDERING START =====
-        
-        # ===== ATTEMPTS + PROGRESS =====
-        st.markdown(
-            f"""
-            🧠 **Attempts Left:** `{attempts_left}` / `{self.max_attempts}`  
-            📏 *Range:* `{self.min_num}` → `{self.max_num}`
-            """
-        )
-        
-        st.markdown(f"👉 **Your Last Guess Was:** `{last_guess_display}`")
+            st.markdown(f"👉 **Your Last Guess Was:** `{last_guess_display}`")
 
-        progress = min(st.session_state.gn_attempts / self.max_attempts, 1.0)
-        st.progress(progress)
+            progress = min(engine.attempts / self.max_attempts, 1.0)
+            st.progress(progress)
 
-        # 4. Display History of Guesses
-        if st.session_state.gn_history:
-            st.subheader("📜 Guess History")
-            
-            # Show the last few entries
-            display_history = st.session_state.gn_history[-MAX_HISTORY_DISPLAY:] 
-            
-            st.dataframe(
-                display_history,
-                column_config={
-                    "Attempt": st.column_config.NumberColumn("Attempt #", help="The count of the guess."),
-                    "Guess": st.column_config.NumberColumn("Your Guess", help="The number you guessed."),
-                    "Result": st.column_config.TextColumn("Direction", help="Too High or Too Low."),
-                    "Closeness": st.column_config.TextColumn("Temperature", help="How close you were.")
-                },
-                hide_index=True,
-            )
+            # 4. Display History of Guesses
+            if st.session_state.gn_history:
+                st.subheader("📜 Guess History")
 
-        st.divider()
+                with span("guess.history_table"):
+                    # Only the last MAX_HISTORY_DISPLAY entries are ever kept
+                    display_history = _history_rows(st.session_state.gn_history, engine)
 
-        # ===== HINT RULES (USER VISIBLE) - Simplified =====
-        st.markdown("ℹ️ **Closeness Meter Rules**")
-        st.markdown(
-                """
-                *Use the direction arrows and the color of the hint to guide your next guess!*
-                
-                **Direction**
-                - 📉 **Too low** (Guess is smaller)
-                - 📈 **Too high** (Guess is larger)
-                
-                **Temperature (How Close You Are - based on $ |Guess - Actual| $ )**
-                - :green[🔥🔥 On Fire!] → Extremely close! Difference between guess and secret number is 5 digits 
-                - :green[✅ Getting HOT!] → Very close! Difference between guess and secret number is 10 digits 
-                - :orange[🟡 Lukewarm.] → Getting closer, Difference between guess and secret number is 20 digits 
-                - :red[🥶 BRRR! It's FREEZING!] → Far away, try a big change.
-                """
-            )
+                    st.dataframe(
+                        display_history,
+                        column_config={
+                            "Attempt": st.column_config.NumberColumn("Attempt #", help="The count of the guess."),
+                            "Guess": st.column_config.NumberColumn("Your Guess", help="The number you guessed."),
+                            "Result": st.column_config.TextColumn("Direction", help="Too High or Too Low."),
+                            "Closeness": st.column_config.TextColumn("Temperature", help="How close you were.")
+                        },
+                        hide_index=True,
+                    )
 
         st.divider()
 
         # ===== GAME STATES =====
+        with st.container(key="gn_result"):
+            # ===== AUDIO PLAYER (SHARED IN-MEMORY ASSETS) =====
+            if st.session_state.gn_sound_path:
+                with span("guess.audio"):
+                    asset = get_sound_library(SOUNDS).get(st.session_state.gn_sound_path)
+                    if asset is not None:
+                        if asset.url:
+                            # Static URL: fetched over HTTP, no audio bytes over the websocket
+                            st.audio(asset.url, format="audio/mp3")
+                        else:
+                            st.audio(asset.as_bytes(), format="audio/mp3", start_time=0)
 
-        if st.session_state.gn_won:
-            st.balloons()
-            st.success(st.session_state.gn_feedback)
-            if st.button("🔄 Play Again", key="gn_win_reset"):
-                self.reset_game()
+                st.session_state.gn_sound_path = None
 
-        elif st.session_state.gn_attempts >= self.max_attempts:
-            st.error(st.session_state.gn_feedback)
-            if st.button("🔄 Try Again", key="gn_lose_reset"):
-                self.reset_game()
+            if engine.won:
+                st.balloons()
+                st.success(st.session_state.gn_feedback)
+                if st.button("🔄 Play Again", key="gn_win_reset"):
+                    self.reset_game()
+                    rerun_fragment()
 
-        else:
-            # Active game
-            if st.session_state.gn_feedback:
-                # Highlight current feedback for the current attempt
-                st.markdown(f"<div style='background-color:#EBF8FF; padding: 10px; border-radius: 5px; border-left: 5px solid #007BFF;'>**Attempt {st.session_state.gn_attempts}:** {st.session_state.gn_feedback}</div>", unsafe_allow_html=True)
-            elif st.session_state.gn_last_guess is None:
-                st.info("Start the game by entering your first guess!")
-
-            with st.form("gn_guess_form"):
+            elif engine.lost:
+                st.error(st.session_state.gn_feedback)
+                if st.button("🔄 Try Again", key="gn_lose_reset"):
+                    self.reset_game()
+                    rerun_fragment()
+
+            else:
+                # Active game
+                if st.session_state.gn_feedback:
+                    # Highlight current feedback for the current attempt
+                    st.markdown(f"<div style='background-color:#EBF8FF; padding: 10px; border-radius: 5px; border-left: 5px solid #007BFF;'>**Attempt {engine.attempts}:** {st.session_state.gn_feedback}</div>", unsafe_allow_html=True)
+                elif engine.last_guess is None:
+                    st.info("Start the game by entering your first guess!")
+
+                with st.form("gn_guess_form"):
                 
-                st.number_input(
-                    "Enter your guess:",
-                    min_value=self.min_num,
-                    max_value=self.max_num,
-                    step=1,
-                    value=st.session_state.gn_input_value,
-                    key="gn_input_value" 
-                )
+                    st.number_input(
+                        "Enter your guess:",
+                        min_value=self.min_num,
+                        max_value=self.max_num,
+                        step=1,
+                        value=st.session_state.gn_input_value,
+                        key="gn_input_value" 
+                    )
+
+                    st.form_submit_button(
+                        "🔍 Check Guess",
+                        on_click=_process_guess, 
+                    )
 
-                st.form_submit_button(
-                    "🔍 Check Guess",
-                    on_click=_process_guess, 
-                )
\ No newline at end of file
+        # Full runs are saved once, at the end of main.py
+        if is_fragment_rerun():
+            persist_session()
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""Vectorized difficulty simulator for Guess the Hidden Number.
+
+Plays whole batches of games at once with NumPy, one array slot per game,
+for three player strategies:
+
+- ``random``: guesses uniformly inside the range the direction hints allow
+- ``binary``: bisects that range, ignoring the temperature hints
+- ``band``:   also narrows the range with the fire/hot/lukewarm/cold band
+
+The scoring matches GuessEngine (a guess within ``bands[i]`` of the secret
+lands in band ``i``). Sweep configurations and pick one for a target win rate:
+
+    python -m Guess_Number.simulator --target 0.35 --strategy band
+"""
+import sys
+import time
+import argparse
+import itertools
+
+import numpy as np
+
+from Guess_Number.engine import BANDS
+
+STRATEGIES = ("random", "binary", "band")
+
+
+# ===================== SINGLE CONFIGURATION =====================
+def simulate(strategy, games=10_000, min_num=1, max_num=100, max_attempts=3,
+             bands=BANDS, seed=None):
+    """Plays ``games`` rounds of one configuration and summarizes them.
+
+    Returns a dict with the win rate and ``attempts_hist``, where index
+    ``k`` (1-based) counts games won on attempt ``k`` and index 0 counts
+    losses.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; choose from {STRATEGIES}")
+
+    rng = np.random.default_rng(seed)
+    limits = np.asarray(bands, dtype=np.int64)
+    # Distance interval (exclusive low, inclusive high) covered by each band
+    band_low = np.concatenate(([0], limits)) + 1
+    band_high = np.concatenate((limits, [max_num - min_num]))
+
+    secret = rng.integers(min_num, max_num + 1, size=games)
+    lo = np.full(games, min_num, dtype=np.int64)
+    hi = np.full(games, max_num, dtype=np.int64)
+    won_on = np.zeros(games, dtype=np.int64)
+    active = np.ones(games, dtype=bool)
+
+    for attempt in range(1, max_attempts + 1):
+        if strategy == "random":
+            guess = rng.integers(lo, hi + 1)
+        else:
+            guess = (lo + hi) // 2
+
+        hit = active & (guess == secret)
+        won_on[hit] = attempt
+        active &= ~hit
+        if not active.any():
+            break
+
+        higher = active & (secret > guess)
+        lower = active & (secret < guess)
+
+        if strategy == "band":
+            band = np.searchsorted(limits, np.abs(secret - guess), side="left")
+            near, far = band_low[band], band_high[band]
+            lo = np.where(higher, np.maximum(lo, guess + near), lo)
+            hi = np.where(higher, np.minimum(hi, guess + far), hi)
+            lo = np.where(lower, np.maximum(lo, guess - far), lo)
+            hi = np.where(lower, np.minimum(hi, guess - near), hi)
+        else:
+            lo = np.where(higher, guess + 1, lo)
+            hi = np.where(lower, guess - 1, hi)
+
+    hist = np.bincount(won_on, minlength=max_attempts + 1)
+    wins = games - int(hist[0])
+    return {
+        "strategy": strategy,
+        "min_num": min_num,
+        "max_num": max_num,
+        "max_attempts": max_attempts,
+        "bands": tuple(int(b) for b in bands),
+        "games": games,
+        "win_rate": wins / games,
+        "mean_attempts_to_win": (
+            float((hist[1:] * np.arange(1, max_attempts + 1)).sum()) / wins if wins else None
+        ),
+        "attempts_hist": hist.tolist(),
+    }
+
+
+# ===================== SWEEPS =====================
+def band_sets(step=5, widest=40):
+    """Every strictly increasing three-band configuration on a ``step`` grid."""
+    values = range(step, widest + 1, step)
+    return [combo for combo in itertools.combinations(values, 3)]
+
+
+def sweep(strategies=STRATEGIES, max_nums=(50, 100, 200), attempts=range(3, 9),
+          bands=None, games=5_000, seed=0):
+    """Simulates every combination of the given settings; returns result dicts."""
+    bands = bands or band_sets()
+    results = []
+    for i, (strategy, max_num, max_attempts, band) in enumerate(
+        itertools.product(strategies, max_nums, attempts, bands)
+    ):
+        results.append(simulate(
+            strategy, games=games, max_num=max_num, max_attempts=max_attempts,
+            bands=band, seed=None if seed is None else seed + i,
+        ))
+    return results
+
+
+def choose(results, target, strategy="band"):
+    """Results for ``strategy`` ordered by distance from the target win rate."""
+    rows = [r for r in results if r["strategy"] == strategy]
+    return sorted(rows, key=lambda r: abs(r["win_rate"] - target))
+
+
+# ===================== CLI =====================
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Guess the Hidden Number settings.")
+    parser.add_argument("--target", type=float, default=0.35, help="Target win rate")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="band")
+    parser.add_argument("--games", type=int, default=5_000)
+    parser.add_argument("--max-nums", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--attempts", type=int, nargs="+", default=list(range(3, 9)))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = sweep(
+        max_nums=args.max_nums, attempts=args.attempts, games=args.games, seed=args.seed
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Simulated {len(results)} configurations x {args.games} games in {elapsed:.2f}s\n")
+
+    current = simulate(args.strategy, games=args.games, seed=args.seed)
+    print(f"Current settings (1-100, 3 attempts, bands {BANDS}): "
+          f"win rate {current['win_rate']:.1%} for '{args.strategy}' players\n")
+
+    print(f"Closest to {args.target:.0%} for '{args.strategy}' players:")
+    print(f"{'range':>8} {'attempts':>8} {'bands':>14} {'win rate':>9} {'mean tries':>11}")
+    for r in choose(results, args.target, args.strategy)[:args.top]:
+        mean = r["mean_attempts_to_win"]
+        print(f"{'1-' + str(r['max_num']):>8} {r['max_attempts']:>8} {str(r['bands']):>14} "
+              f"{r['win_rate']:9.1%} {mean if mean is None else round(mean, 2):>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import secrets
+
+import numpy as np
+
+# --- GAME MODES ---
+# VALUE: "is this number somewhere in the grid?"
+# POSITION: "which number was in this cell?"
+VALUE = "value"
+POSITION = "position"
+MODES = (VALUE, POSITION)
+
+
+def value_range(size):
+    """Highest value drawn for a grid of ``size``: 1-9 classic, wider as it grows."""
+    return max(9, size * size)
+
+
+class MatrixEngine:
+    """Streamlit-free rules of Memory Matrix.
+
+    The grid is a compact NumPy array drawn from a seeded generator, so the
+    seed alone reproduces it (and is all a snapshot has to keep). A bitmap
+    indexed by value answers membership guesses in O(1) at any size.
+    """
+
+    __slots__ = (
+        "size", "max_attempts", "low", "high", "seed", "mode", "grid", "present",
+        "attempts", "revealed", "correct", "target", "_rng",
+    )
+
+    def __init__(self, size=3, max_attempts=3, low=1, high=9, seed=None, mode=VALUE):
+        self.size = size
+        self.max_attempts = max_attempts
+        self.low = low
+        self.high = high
+        self.seed = secrets.randbits(63) if seed is None else seed
+        self.mode = mode
+        self._rng = np.random.default_rng(self.seed)
+
+        # uint8 for the classic 1-9 grid, uint16 up to 100x100
+        self.grid = self._rng.integers(
+            low, high, size=(size, size), endpoint=True, dtype=np.min_scalar_type(high)
+        )
+        self.present = np.zeros(high + 1, dtype=bool)
+        self.present[self.grid.ravel()] = True
+
+        self.attempts = 0
+        self.correct = 0
+        self.revealed = False
+        self.pick_cell()
+
+    # ----- compact state (see common.session) -----
+    def to_state(self):
+        return [
+            self.size, self.max_attempts, self.low, self.high, self.seed, self.mode,
+            self.attempts, self.correct, int(self.revealed), list(self.target),
+        ]
+
+    @classmethod
+    def from_state(cls, state):
+        size, max_attempts, low, high, seed, mode, attempts, correct, revealed, target = state
+        engine = cls(size, max_attempts, low, high, seed, mode)
+        engine.attempts = attempts
+        engine.correct = correct
+        engine.revealed = bool(revealed)
+        engine.target = tuple(target)
+        return engine
+
+    @property
+    def matrix(self):
+        """The grid as nested lists (JSON-ready)."""
+        return self.grid.tolist()
+
+    @property
+    def values(self):
+        return frozenset(np.flatnonzero(self.present).tolist())
+
+    @property
+    def finished(self):
+        return self.attempts >= self.max_attempts
+
+    def reveal(self):
+        """Hides the grid and starts the guessing phase."""
+        self.revealed = True
+
+    def contains(self, value):
+        value = int(value)
+        return self.low <= value <= self.high and bool(self.present[value])
+
+    def pick_cell(self):
+        """Chooses the (row, col) the next position question asks about."""
+        self.target = divmod(int(self._rng.integers(self.size * self.size)), self.size)
+
+    def guess(self, value):
+        """Counts one attempt; returns whether ``value`` appears in the grid."""
+        hit = self.contains(value)
+        self.attempts += 1
+        self.correct += hit
+        return hit
+
+    def recall(self, value):
+        """Counts one attempt; returns whether ``value`` was in the target cell."""
+        hit = int(value) == int(self.grid[self.target])
+        self.attempts += 1
+        self.correct += hit
+        self.pick_cell()
+        return hit
+
+    def answer(self, value):
+        """Scores ``value`` against the current mode's question."""
+        return self.recall(value) if self.mode == POSITION else self.guess(value)
@@ -1,33 +1,164 @@
 import streamlit as st
-import random
+
+from common.events import emit
+from common.metrics import span, timed
+from common.session import persist_session
+from common.ui import is_fragment_rerun, rerun_fragment
+from Memory_Matrix.engine import MODES, POSITION, VALUE, MatrixEngine, value_range
+
+# --- GRID SIZES ---
+# 3x3 is the classic board; everything past 5x5 is "expert mode"
+MATRIX_SIZES = (3, 4, 5, 10, 25, 50, 100)
+
+MODE_LABELS = {
+    VALUE: "🔎 Spot the number",
+    POSITION: "📍 Recall the cell",
+}
+
+
+def _grid_frame(grid):
+    """The grid as one DataFrame with 1-based row and column labels."""
+    # Imported on first render, not at app start (pandas adds ~300 ms)
+    import pandas as pd
+
+    labels = range(1, grid.shape[0] + 1)
+    return pd.DataFrame(grid, index=labels, columns=[str(c) for c in labels])
+
 
 class MemoryMatrix:
-    def __init__(self, size=3):
-        self.matrix = [[random.randint(1, 9) for _ in range(size)] for _ in range(size)]
-        self.attempts = 0
-        self.revealed = False
-        self.guess = None
+    """Streamlit view over a headless MatrixEngine kept in session state."""
+
+    def __init__(self, size=3, max_attempts=3, seed=None):
+        self.max_attempts = max_attempts
+
+        if "mm_engine" not in st.session_state:
+            st.session_state.mm_engine = self._new_engine(size, VALUE, seed)
+
+        # Result of the last answer (None before the first one)
+        if "mm_last" not in st.session_state:
+            st.session_state.mm_last = None
+
+    def _new_engine(self, size, mode, seed=None):
+        return MatrixEngine(
+            size=size, max_attempts=self.max_attempts, high=value_range(size),
+            seed=seed, mode=mode,
+        )
+
+    @property
+    def engine(self):
+        return st.session_state.mm_engine
+
+    @property
+    def matrix(self):
+        return self.engine.matrix
+
+    @property
+    def attempts(self):
+        return self.engine.attempts
+
+    @property
+    def revealed(self):
+        return self.engine.revealed
+
+    def reset_game(self, size=None, mode=None):
+        """Starts a new grid, keeping the current size and mode unless given."""
+        engine = self.engine
+        st.session_state.mm_engine = self._new_engine(size or engine.size, mode or engine.mode)
+        st.session_state.mm_last = None
+
+    def play(self):
+        """Renders the board as a fragment; answers rerun only the board."""
+        st.fragment(self.render_board)()
+
+    @timed("matrix.board")
+    def render_board(self):
+        engine = self.engine
+        if not engine.revealed:
+            self.render_settings()
+            self.display_matrix()
+        elif engine.finished:
+            self.display_results()
+        else:
+            self.get_guess()
+
+        # Full runs are saved once, at the end of main.py
+        if is_fragment_rerun():
+            persist_session()
+
+    def render_settings(self):
+        """Size and mode pickers; changing either deals a new grid."""
+        engine = self.engine
+
+        def _apply_settings():
+            self.reset_game(st.session_state.matrix_size, st.session_state.matrix_mode)
+
+        size_col, mode_col = st.columns(2)
+        size_col.select_slider(
+            "Grid size",
+            options=MATRIX_SIZES,
+            value=engine.size,
+            format_func=lambda n: f"{n}×{n}",
+            key="matrix_size",
+            on_change=_apply_settings,
+        )
+        mode_col.radio(
+            "Mode",
+            MODES,
+            index=MODES.index(engine.mode),
+            format_func=MODE_LABELS.get,
+            key="matrix_mode",
+            on_change=_apply_settings,
+        )
+
+    def render_grid(self):
+        """The whole grid in one dataframe element, whatever its size."""
+        with span("matrix.grid"):
+            st.dataframe(_grid_frame(self.engine.grid))
 
     def display_matrix(self):
-        st.write("Memorize the numbers below for 5 seconds:")
-        for row in self.matrix:
-            st.write(row)
-        if st.button('Reveal', key="matrix_reveal"):
-            self.revealed = True
-            st.rerun()
+        st.write("Memorize the numbers below, then hide them and start guessing:")
+        self.render_grid()
+        if st.button("🙈 Hide & Guess", key="matrix_reveal"):
+            self.engine.reveal()
+            rerun_fragment()
+
+    def _submit(self):
+        engine = self.engine
+        hit = engine.answer(st.session_state.matrix_guess)
+        st.session_state.mm_last = hit
+        emit("matrix_answer", mode=engine.mode, size=engine.size, correct=hit)
 
     def get_guess(self):
-        if self.revealed:
-            st.write("Now guess a number from the matrix:")
-            self.guess = st.number_input("Enter a number:", min_value=1, max_value=9, key="matrix_guess")
-            if st.button('Submit', key="matrix_submit"):
-                if self.guess in [num for row in self.matrix for num in row]:
-                    st.success("Correct! 🎉")
-                else:
-                    st.error("Wrong! Try again.")
-                self.attempts += 1
-                if self.attempts >= 3:
-                    st.write("You lose! The matrix was:")
-                    for row in self.matrix:
-                        st.write(row)
-                st.rerun()
+        engine = self.engine
+        if st.session_state.mm_last is True:
+            st.success("Correct! 🎉")
+        elif st.session_state.mm_last is False:
+            st.error("Wrong! Try again.")
+
+        st.markdown(
+            f"🧠 **Attempts Left:** `{engine.max_attempts - engine.attempts}` / `{engine.max_attempts}`"
+        )
+        if engine.mode == POSITION:
+            row, col = engine.target
+            prompt = f"Which number was in row {row + 1}, column {col + 1}?"
+        else:
+            prompt = "Now guess a number from the matrix:"
+
+        with st.form("matrix_guess_form"):
+            st.number_input(
+                prompt, min_value=engine.low, max_value=engine.high, step=1, key="matrix_guess"
+            )
+            st.form_submit_button("Submit", on_click=self._submit)
+
+    def display_results(self):
+        engine = self.engine
+        if engine.correct == engine.max_attempts:
+            st.success(f"Perfect memory! {engine.correct} / {engine.max_attempts} 🎉")
+        else:
+            st.error(f"Game over! You got {engine.correct} / {engine.max_attempts}.")
+
+        st.write("The matrix was:")
+        self.render_grid()
+        if st.button("🔄 Play Again", key="matrix_reset"):
+            self.reset_game()
+            rerun_fragment()
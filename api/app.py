@@ -0,0 +1,270 @@
+"""Stateless JSON API for the festival games, for thin kiosk clients.
+
+Every response carries a signed token holding the compact game state; the
+client sends it back with the next move, so any worker can serve any
+request. Secrets (the hidden number, the matrix) are never in the token:
+they are re-derived from a nonce with the server key. Question sets live
+in the shared quiz store and are referenced by id.
+
+Tokens are single-use and expire: each carries an id that the shared
+ledger (api.tokens.TokenLedger) records once it has been played, so
+resending a token, whether an old guess or a quiz answer, is refused and
+attempt limits hold. All workers need the same FEST_API_SECRET and
+ledger path; the API refuses to start without the secret.
+
+    FEST_API_SECRET=... uvicorn api.app:app --workers 4
+
+Handlers that touch SQLite (the token ledger, the quiz store) or the LLM
+are plain ``def``: FastAPI runs them in its threadpool, so a busy write
+lock never stalls the event loop. Pure-CPU handlers stay ``async``.
+
+GET /metrics is a Prometheus text exposition of this worker plus the
+samples every other process (Streamlit workers included) dumps to disk.
+"""
+import os
+import time
+
+os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+from api.tokens import (
+    InvalidToken,
+    derive_seed,
+    get_token_ledger,
+    new_nonce,
+    sign,
+    verify,
+)
+from common.metrics import FEST_PROFILE, read_expositions, registry
+from Guess_Number.engine import BAND_NAMES, GuessEngine
+from interactive_quiz.cache import get_quiz_cache
+from interactive_quiz.engine import QuizEngine
+from interactive_quiz.prompts import QUIZ_MAX_QUESTIONS, QUIZ_QUESTIONS_PER_QUIZ
+from Memory_Matrix.engine import MatrixEngine, value_range
+
+app = FastAPI(title="Food Fest Games API")
+
+
+# ===================== HELPERS =====================
+def _state(token, game):
+    try:
+        state = verify(token)
+    except InvalidToken as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    if state.get("t") != game:
+        raise HTTPException(status_code=400, detail=f"Not a {game} token")
+    return state
+
+
+def _spend(state):
+    """Uses up the token of an accepted move; a replayed one is refused."""
+    if not get_token_ledger().spend(state):
+        raise HTTPException(status_code=409, detail="Token already used")
+
+
+def _finished():
+    return HTTPException(status_code=409, detail="The round is over; start a new game")
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"ok": True}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    text = registry.render_prometheus(read_expositions())
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+
+if FEST_PROFILE:
+    @app.middleware("http")
+    async def time_routes(request: Request, call_next):
+        started = time.perf_counter()
+        response = await call_next(request)
+        # Route templates, not raw paths, keep the label set small
+        route = request.scope.get("route")
+        name = "api." + (route.path if route is not None else "unmatched")
+        registry.histogram(name).observe(time.perf_counter() - started)
+        return response
+
+
+# ===================== GUESS THE NUMBER =====================
+class NewGuessGame(BaseModel):
+    min_num: int = Field(1, ge=0)
+    max_num: int = Field(100, le=1_000_000)
+    max_attempts: int = Field(3, ge=1, le=100)
+
+
+class GuessMove(BaseModel):
+    token: str
+    value: int
+
+
+def _guess_engine(state):
+    engine = GuessEngine(
+        state["lo"], state["hi"], state["m"], seed=derive_seed(state["n"], "guess")
+    )
+    engine.attempts = state["a"]
+    engine.won = bool(state["w"])
+    return engine
+
+
+@app.post("/guess/new")
+async def new_guess_game(req: NewGuessGame):
+    if req.max_num <= req.min_num:
+        raise HTTPException(status_code=422, detail="max_num must exceed min_num")
+
+    state = {
+        "t": "guess", "n": new_nonce(),
+        "lo": req.min_num, "hi": req.max_num, "m": req.max_attempts,
+        "a": 0, "w": 0,
+    }
+    return {
+        "token": sign(state),
+        "min_num": req.min_num,
+        "max_num": req.max_num,
+        "attempts_left": req.max_attempts,
+    }
+
+
+@app.post("/guess")
+def guess(req: GuessMove):
+    state = _state(req.token, "guess")
+    engine = _guess_engine(state)
+    if engine.finished:
+        raise _finished()
+    if not engine.min_num <= req.value <= engine.max_num:
+        raise HTTPException(status_code=422, detail="Guess is out of range")
+    _spend(state)
+
+    direction, band = engine.guess(req.value)
+    state["a"] = engine.attempts
+    state["w"] = int(engine.won)
+
+    body = {
+        "direction": direction,
+        "band": None if engine.won else BAND_NAMES[min(band, len(BAND_NAMES) - 1)],
+        "won": engine.won,
+        "lost": engine.lost,
+        "attempts_left": engine.attempts_left,
+        "token": sign(state),
+    }
+    if engine.finished:
+        body["secret"] = engine.secret
+    return body
+
+
+# ===================== INTERACTIVE QUIZ =====================
+class NewQuiz(BaseModel):
+    topic: str = Field(min_length=1, max_length=100)
+    count: int = Field(QUIZ_QUESTIONS_PER_QUIZ, ge=1, le=QUIZ_MAX_QUESTIONS)
+
+
+class QuizAnswer(BaseModel):
+    token: str
+    option: str
+
+
+def _generate(topic, count):
+    # Same tiers as the Streamlit booth: warm pool, cache, then the LLM
+    from interactive_quiz.quiz import InteractiveQuiz
+    return InteractiveQuiz.generate_questions(topic, count)
+
+
+@app.post("/quiz/new")
+def new_quiz(req: NewQuiz):
+    questions = _generate(req.topic, req.count)
+    if not questions:
+        raise HTTPException(status_code=503, detail="Could not generate a quiz")
+
+    set_id = get_quiz_cache().store_set(questions)
+    state = {"t": "quiz", "q": set_id, "i": 0, "s": 0}
+    return {
+        "token": sign(state),
+        "questions": [
+            {"question": q["question"], "options": q["options"]} for q in questions
+        ],
+    }
+
+
+@app.post("/quiz/answer")
+def answer_quiz(req: QuizAnswer):
+    state = _state(req.token, "quiz")
+    questions = get_quiz_cache().load_set(state["q"])
+    if questions is None:
+        raise HTTPException(status_code=410, detail="Quiz expired; start a new one")
+
+    engine = QuizEngine(questions)
+    engine.current = state["i"]
+    engine.score = state["s"]
+    if engine.finished:
+        raise _finished()
+    _spend(state)
+
+    answer = engine.current_question()["answer"]
+    correct = engine.answer(req.option)
+    state["i"] = engine.current
+    state["s"] = engine.score
+    return {
+        "correct": correct,
+        "answer": answer,
+        "score": engine.score,
+        "finished": engine.finished,
+        "token": sign(state),
+    }
+
+
+# ===================== MEMORY MATRIX =====================
+class NewMatrix(BaseModel):
+    size: int = Field(3, ge=2, le=10)
+
+
+class MatrixGuess(BaseModel):
+    token: str
+    value: int
+
+
+def _matrix_engine(state):
+    # Same value range as the Streamlit view, or a big grid holds every value
+    engine = MatrixEngine(
+        size=state["z"], high=value_range(state["z"]),
+        seed=derive_seed(state["n"], "matrix"),
+    )
+    engine.attempts = state["a"]
+    engine.correct = state["c"]
+    engine.revealed = True
+    return engine
+
+
+@app.post("/matrix/new")
+async def new_matrix(req: NewMatrix):
+    state = {"t": "matrix", "n": new_nonce(), "z": req.size, "a": 0, "c": 0}
+    engine = _matrix_engine(state)
+    return {"token": sign(state), "matrix": engine.matrix}
+
+
+@app.post("/matrix/guess")
+def matrix_guess(req: MatrixGuess):
+    state = _state(req.token, "matrix")
+    engine = _matrix_engine(state)
+    if engine.finished:
+        raise _finished()
+    _spend(state)
+
+    hit = engine.guess(req.value)
+    state["a"] = engine.attempts
+    state["c"] = engine.correct
+
+    body = {
+        "correct": hit,
+        "attempts_left": engine.max_attempts - engine.attempts,
+        "finished": engine.finished,
+        "token": sign(state),
+    }
+    if engine.finished:
+        body["matrix"] = engine.matrix
+    return body
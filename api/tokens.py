@@ -0,0 +1,145 @@
+import os
+import hmac
+import json
+import time
+import base64
+import sqlite3
+import hashlib
+import secrets
+import threading
+
+from common.sqlite import ProcessWide, connect
+
+# --- SIGNING KEY ---
+# Every worker behind the load balancer must share this key. A random
+# per-process fallback would make each worker reject the others' tokens,
+# so the API refuses to start without it.
+FEST_API_SECRET = os.getenv("FEST_API_SECRET")
+if not FEST_API_SECRET:
+    raise RuntimeError(
+        "FEST_API_SECRET is not set; every API worker needs the same signing key"
+    )
+_KEY = FEST_API_SECRET.encode("utf-8")
+
+# --- SINGLE-USE TOKENS ---
+# A token is accepted for one move within this many seconds of being issued
+FEST_API_TOKEN_TTL = int(os.getenv("FEST_API_TOKEN_TTL", str(6 * 60 * 60)))
+# Spent token ids, shared by every worker (like the quiz store)
+FEST_API_LEDGER_PATH = os.getenv(
+    "FEST_API_LEDGER_PATH", os.path.join("data", "api_tokens.sqlite3")
+)
+# Expired ids are deleted at most this often
+_PRUNE_INTERVAL = 60
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _mac(data):
+    return hmac.new(_KEY, data, hashlib.sha256).digest()[:16]
+
+
+def sign(state):
+    """Compact ``payload.signature`` token for a small JSON-able dict.
+
+    Each token gets its own id ("j") and expiry ("x"), so it can be spent
+    exactly once (see TokenLedger).
+    """
+    state = dict(state, j=new_nonce(), x=int(time.time()) + FEST_API_TOKEN_TTL)
+    payload = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_mac(payload))}"
+
+
+def verify(token):
+    """Returns the state inside ``token`` or raises InvalidToken."""
+    try:
+        payload_part, mac_part = token.split(".", 1)
+        payload = _b64decode(payload_part)
+        mac = _b64decode(mac_part)
+    except (ValueError, AttributeError):
+        raise InvalidToken("Malformed token")
+
+    if not hmac.compare_digest(mac, _mac(payload)):
+        raise InvalidToken("Bad token signature")
+    state = json.loads(payload)
+    if state.get("x", 0) < time.time():
+        raise InvalidToken("Token expired")
+    return state
+
+
+def new_nonce():
+    return secrets.token_hex(8)
+
+
+def derive_seed(nonce, purpose):
+    """Server-only seed for a game: the token carries the nonce, never the secret."""
+    digest = hmac.new(_KEY, f"{purpose}:{nonce}".encode("utf-8"), hashlib.sha256).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+# ===================== SPENT TOKENS =====================
+class TokenLedger:
+    """Ids of tokens already used for a move, kept until the tokens expire.
+
+    Spending is one INSERT on a primary key, so of two workers racing to
+    accept the same token exactly one wins. Once a token has expired
+    ``verify`` rejects it anyway, and its id is deleted.
+    """
+
+    def __init__(self, path=FEST_API_LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = self._connect(path)
+        self._pruned_at = 0.0
+
+        self.spent = 0
+        self.replays = 0
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS spent_tokens ("
+            " token_id TEXT PRIMARY KEY,"
+            " expires_at INTEGER NOT NULL)",
+        )
+
+    def spend(self, state):
+        """Marks a verified token as used; returns False if it already was."""
+        now = time.time()
+        with self._lock, self._db:
+            try:
+                self._db.execute(
+                    "INSERT INTO spent_tokens (token_id, expires_at) VALUES (?, ?)",
+                    (state["j"], state["x"]),
+                )
+            except sqlite3.IntegrityError:
+                self.replays += 1
+                return False
+            self.spent += 1
+
+            if now - self._pruned_at > _PRUNE_INTERVAL:
+                self._pruned_at = now
+                self._db.execute("DELETE FROM spent_tokens WHERE expires_at < ?", (now,))
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"spent": self.spent, "replays": self.replays}
+
+
+_ledger = ProcessWide("api_tokens", TokenLedger)
+
+
+def get_token_ledger():
+    """Returns the process-wide ledger of spent tokens."""
+    return _ledger.get()
@@ -0,0 +1,176 @@
+"""Deterministic stand-in for the OpenAI-compatible quiz endpoint.
+
+Answers ``POST .../chat/completions`` (plain or ``stream: true``) with a
+valid quiz for the topic and question count found in the prompt. Latency
+and the error rate are configurable; a seed makes both reproducible.
+
+    python -m benchmarks.fake_llm --port 8999 --latency 0.8 --error-rate 0.05
+
+Point the app at it with OPENAI_COMPATIBLE_ENDPOINT=http://127.0.0.1:8999/v1.
+"""
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_COUNT = re.compile(r"EXACTLY (\d+) multiple-choice")
+_TOPIC = re.compile(r"on the topic: '(.*?)'")
+
+
+def quiz_text(topic, count):
+    """The same valid question set for the same (topic, count), every time."""
+    questions = []
+    for i in range(count):
+        digest = hashlib.sha1(f"{topic}:{i}".encode("utf-8")).hexdigest()
+        options = [f"{topic} fact {digest[j:j + 4]}" for j in (0, 4, 8, 12)]
+        questions.append({
+            "question": f"{topic} question {i + 1}: which statement is true?",
+            "options": options,
+            "answer": options[int(digest[16], 16) % len(options)],
+        })
+    return json.dumps(questions, indent=2)
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.5, jitter=0.2, error_rate=0.0, seed=0,
+                 chunk_size=24):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def plan(self):
+        """(delay, fail) for the next request, drawn from the seeded stream."""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+            self.errors += fail
+        return delay, fail
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors}
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-llm", daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "Bad JSON"}})
+        if not self.path.rstrip("/").endswith("chat/completions"):
+            return self._json(404, {"error": {"message": "Unknown route"}})
+
+        delay, fail = self.server.plan()
+        time.sleep(delay)
+        if fail:
+            return self._json(500, {"error": {"message": "Injected failure"}})
+
+        prompt = "\n".join(
+            m.get("content") or "" for m in body.get("messages", ())
+            if isinstance(m.get("content"), str)
+        )
+        count = _COUNT.search(prompt)
+        topic = _TOPIC.search(prompt)
+        text = quiz_text(
+            topic.group(1) if topic else "general knowledge",
+            int(count.group(1)) if count else 5,
+        )
+
+        if body.get("stream"):
+            return self._stream(body.get("model", "fake"), text)
+        return self._json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                      "total_tokens": (len(prompt) + len(text)) // 4},
+        })
+
+    def _json(self, status, payload):
+        raw = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _stream(self, model, text):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        size = self.server.chunk_size
+        for i in range(0, len(text), size):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": text[i:i + size]},
+                             "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        (args.host, args.port), latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, seed=args.seed,
+    )
+    print(f"Fake LLM endpoint at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Guess handling throughput of GuessTheNumber, measured headlessly.
+
+Drives the game through Streamlit's AppTest and times a full submit ->
+rerun cycle per guess. The reveal animation runs in the browser, so the
+server-side cost is the same for any reveal delay. The old blocking
+``time.sleep(1.2)`` path no longer exists, so its figure is an estimate
+(measured time plus the sleep), not a measurement.
+
+    python -m benchmarks.guess_throughput --guesses 200
+"""
+import sys
+import time
+import argparse
+
+from streamlit.testing.v1 import AppTest
+
+LEGACY_SERVER_SLEEP = 1.2  # seconds per guess before the client-side reveal; not re-measured
+
+
+def _app(reveal_delay):
+    from Guess_Number.guess_the_number import GuessTheNumber
+
+    GuessTheNumber(
+        min_num=1, max_num=100, max_attempts=10**9, reveal_delay=reveal_delay
+    ).play()
+
+
+def measure(guesses, reveal_delay):
+    """Returns the per-guess wall time (seconds) of submit + rerun."""
+    at = AppTest.from_function(_app, args=(reveal_delay,), default_timeout=30)
+    at.run()
+    # Out of range, so no guess can end the round
+    at.session_state["gn_engine"].secret = 0
+
+    timings = []
+    for i in range(guesses):
+        at.number_input(key="gn_input_value").set_value(1 + i % 100)
+        started = time.perf_counter()
+        next(b for b in at.button if b.label == "🔍 Check Guess").click().run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guesses", type=int, default=200)
+    parser.add_argument("--reveal-delay", type=float, default=1.2)
+    args = parser.parse_args()
+
+    timings = sorted(measure(args.guesses, args.reveal_delay))
+    mean = sum(timings) / len(timings)
+    p95 = timings[int(0.95 * (len(timings) - 1))]
+
+    print(f"guesses timed          : {len(timings)}")
+    print(f"mean / p95 per guess   : {mean * 1000:.1f} ms / {p95 * 1000:.1f} ms")
+    print(f"guesses/s per runner   : {1 / mean:.1f}")
+    print(f"legacy (estimate)      : {1 / (mean + LEGACY_SERVER_SLEEP):.2f} guesses/s "
+          f"with the {LEGACY_SERVER_SLEEP}s server sleep added")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
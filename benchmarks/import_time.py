@@ -0,0 +1,89 @@
+"""Startup import-time report for the modules main.py imports.
+
+Imports every top-level import of main.py in a fresh interpreter under
+``python -X importtime``, prints the slowest modules, and exits non-zero
+when the LLM stack leaks into startup or the total exceeds the budget.
+
+    python -m benchmarks.import_time --budget-ms 1500 --top 15
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Packages that must only load when a quiz is actually generated
+LAZY_PACKAGES = ("crewai", "litellm", "langchain", "openai")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def startup_imports(path=MAIN):
+    """Module names imported at the top level of ``path``."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return names
+
+
+def measure(modules):
+    """Returns ``[(self_us, cumulative_us, depth, module)]`` for one cold import."""
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = measure(startup_imports())
+    total_ms = sum(cum for _, cum, depth, _ in rows if depth == 0) / 1000
+
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for self_us, cum_us, _, module in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{cum_us / 1000:14.1f}  {self_us / 1000:8.1f}  {module}")
+    print(f"\nTotal startup import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    leaked = sorted({
+        module for *_, module in rows
+        if module.split(".")[0] in LAZY_PACKAGES
+    })
+    failed = False
+    if leaked:
+        print("FAIL: LLM stack imported at startup: " + ", ".join(leaked[:10]))
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: startup imports exceed the budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
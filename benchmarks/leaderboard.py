@@ -0,0 +1,96 @@
+"""Leaderboard write and read cost under concurrent players.
+
+Several threads submit results while a reader polls the top K, the way
+the sidebar and the big screen do. Reports submit and read latency, the
+time the background writer needs to drain the queue, and checks the
+in-memory top K against an indexed SQL query.
+
+    python -m benchmarks.leaderboard --results 50000 --writers 8
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+from common.leaderboard import GAMES, Leaderboard
+
+
+def _percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=50_000)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--reads", type=int, default=20_000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "leaderboard.sqlite3")
+    board = Leaderboard(path=path, flush_interval=0.2, refresh_interval=3600)
+
+    per_writer = args.results // args.writers
+    submit_times = [[] for _ in range(args.writers)]
+
+    def write(slot):
+        rng = random.Random(slot)
+        timings = submit_times[slot]
+        for i in range(per_writer):
+            if i % 2:
+                row = ("quiz", f"p{slot}-{i}", rng.randint(0, 5), 5)
+            else:
+                row = ("number", f"p{slot}-{i}", rng.randint(1, 3), 3)
+            started = time.perf_counter()
+            board.submit(*row)
+            timings.append(time.perf_counter() - started)
+
+    read_times = []
+
+    def read():
+        for i in range(args.reads):
+            started = time.perf_counter()
+            board.top("quiz" if i % 2 else "number")
+            read_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(args.writers)]
+    threads.append(threading.Thread(target=read))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    submitted = time.perf_counter() - started
+
+    drain_started = time.perf_counter()
+    while board.stats()["pending"]:
+        time.sleep(0.01)
+    drained = time.perf_counter() - drain_started
+
+    submits = [t for timings in submit_times for t in timings]
+    print(f"results submitted      : {len(submits)} by {args.writers} writers in {submitted:.2f}s")
+    print(f"submit p50 / p99       : {_percentile(submits, 0.5) * 1e6:.1f} / "
+          f"{_percentile(submits, 0.99) * 1e6:.1f} us")
+    print(f"top-K read p50 / p99   : {_percentile(read_times, 0.5) * 1e6:.1f} / "
+          f"{_percentile(read_times, 0.99) * 1e6:.1f} us")
+    print(f"queue drained after    : {drained * 1000:.0f} ms ({board.stats()['flushes']} batches)")
+
+    # The in-memory ranking must agree with the indexed query
+    for game in GAMES:
+        expected = [entry[2:4] for entry in board._load_top(game)]
+        actual = [(player, score) for player, score, _, _ in board.top(game)]
+        if actual != expected:
+            print(f"MISMATCH for {game}: {actual} != {expected}")
+            return 1
+
+    query_started = time.perf_counter()
+    board._load_top("quiz")
+    print(f"indexed top-K query    : {(time.perf_counter() - query_started) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""Concurrent-player load test of main.py, driven headlessly through AppTest.
+
+Each simulated player logs in, plays guess-the-number rounds (bisecting on
+the direction hints) and then takes quizzes on topics from a small list,
+answering every question. The quiz endpoint is the local fake from
+benchmarks.fake_llm, with configurable latency and error rate. Every
+interaction (click -> rerun) is timed.
+
+    python -m benchmarks.load_test --players 20 --rounds 3 --quizzes 1 \\
+        --llm-latency 0.8 --llm-error-rate 0.05 --out load.json
+
+    # later, after a change
+    python -m benchmarks.load_test ... --out new.json --compare load.json
+
+The JSON report holds per-interaction latency percentiles, throughput,
+errors and memory per session, so runs can be compared for regressions.
+"""
+import os
+import sys
+import json
+import time
+import random
+import resource
+import argparse
+import tempfile
+import threading
+import subprocess
+import contextlib
+from collections import defaultdict
+from unittest.mock import MagicMock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+PASSWORD = "fest2025"
+TOPICS = ("Python", "SQL", "Food Safety", "Indian Cuisine", "Machine Learning")
+
+
+def _isolate(workdir, llm_url):
+    """Points every store and the LLM client at throwaway locations."""
+    os.environ.update({
+        "STATE_DB_PATH": os.path.join(workdir, "session_state.sqlite3"),
+        "QUIZ_CACHE_PATH": os.path.join(workdir, "quiz_cache.sqlite3"),
+        "LEADERBOARD_PATH": os.path.join(workdir, "leaderboard.sqlite3"),
+        # Fake LLM sets must never reach the real question bank
+        "QUIZ_BANK_PATH": os.path.join(workdir, "question_bank.sqlite3"),
+        "FEST_API_LEDGER_PATH": os.path.join(workdir, "api_tokens.sqlite3"),
+        "EVENT_LOG_DIR": os.path.join(workdir, "events"),
+        "FEST_METRICS_DIR": os.path.join(workdir, "metrics"),
+        "OPENAI_COMPATIBLE_ENDPOINT": llm_url,
+        "Custom_OPENAI_API_KEY": "fake-key",
+        "GN_REVEAL_DELAY": "0",
+        "QUIZ_PREWARM": "0",
+        "QUIZ_POOL_REFILL_SECONDS": "86400",
+    })
+    os.environ.pop("OPENAI_COMPATIBLE_ENDPOINT_BACKUP", None)
+
+
+def _share_runtime():
+    """Lets AppTest instances run side by side, like sessions on one server.
+
+    Each AppTest run installs a private mock Runtime singleton and clears it
+    afterwards, which breaks every other run in flight. Here all sessions
+    share one runtime, and AppTest's per-run swaps land on a throwaway
+    subclass instead.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import (
+        MemoryCacheStorageManager,
+    )
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+
+    app_test.Runtime = type("PerRunRuntime", (Runtime,), {})
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+
+
+# ===================== SIMULATED PLAYER =====================
+class Player:
+    """One browser session; records (interaction, seconds) samples."""
+
+    def __init__(self, index, args, samples, errors):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.args = args
+        self.samples = samples
+        self.errors = errors
+        self.rng = random.Random(args.seed + index)
+        self.at = AppTest.from_file(MAIN, default_timeout=args.timeout)
+
+    def _timed(self, name, action):
+        started = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.errors[name].append(f"{type(e).__name__}: {e}")
+            return False
+        self.samples[name].append(time.perf_counter() - started)
+        if self.at.exception:
+            self.errors[name].append(self.at.exception[0].message)
+            return False
+        return True
+
+    def _button(self, label, sidebar=False):
+        buttons = self.at.sidebar.button if sidebar else self.at.button
+        return next(b for b in buttons if label in b.label)
+
+    def run(self):
+        at = self.at
+        self._timed("first_load", at.run)
+        at.text_input[0].input(PASSWORD)
+        self._timed("login", self._button("Login").click().run)
+        at.sidebar.text_input(key="player_name").input(f"load-{self.index}")
+
+        if self.args.rounds:
+            self._timed("open_guess", self._button("Hidden Number", sidebar=True).click().run)
+            for _ in range(self.args.rounds):
+                self.play_round()
+
+        for _ in range(self.args.quizzes):
+            self.take_quiz()
+
+    def play_round(self):
+        at = self.at
+        engine = at.session_state.gn_engine
+        lo, hi = engine.min_num, engine.max_num
+        while not engine.finished:
+            guess = (lo + hi) // 2
+            at.number_input(key="gn_input_value").set_value(guess)
+            if not self._timed("guess", self._button("Check Guess").click().run):
+                return
+            engine = at.session_state.gn_engine
+            _, _, direction, _ = at.session_state.gn_history[-1]
+            if direction > 0:
+                hi = guess - 1
+            elif direction < 0:
+                lo = guess + 1
+        label = "Play Again" if engine.won else "Try Again"
+        self._timed("new_round", self._button(label).click().run)
+
+    def take_quiz(self):
+        at = self.at
+        self._timed("open_quiz", self._button("Interactive Quiz", sidebar=True).click().run)
+        at.text_input[0].input(self.rng.choice(TOPICS))
+        if not self._timed("generate_quiz", self._button("Generate Quiz").click().run):
+            return
+        if at.session_state.quiz is None:
+            shown = [e.value for e in at.error]
+            self.errors["generate_quiz"].append(shown[0] if shown else "No quiz was generated")
+            return
+
+        while True:
+            submit = [b for b in at.button if b.label == "Submit"]
+            if not submit:
+                break
+            radio = at.radio[0]
+            radio.set_value(self.rng.choice(radio.options))
+            if not self._timed("answer", submit[0].click().run):
+                return
+
+
+# ===================== REPORT =====================
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        "count": len(samples),
+        "p50_ms": round(pick(0.50) * 1000, 2),
+        "p95_ms": round(pick(0.95) * 1000, 2),
+        "p99_ms": round(pick(0.99) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, tolerance):
+    """Prints p95 and throughput changes; returns True when within tolerance."""
+    ok = True
+    print(f"\nCompared with {baseline.get('revision')} ({baseline.get('started')}):")
+    workload = ("players", "rounds", "quizzes", "llm_latency", "llm_error_rate")
+    differs = [k for k in workload if baseline.get("config", {}).get(k) != report["config"][k]]
+    if differs:
+        print(f"  warning: workload differs from the baseline ({', '.join(differs)})")
+    for name, stats in sorted(report["interactions"].items()):
+        before = baseline.get("interactions", {}).get(name)
+        if not before:
+            continue
+        change = stats["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        flag = "  REGRESSION" if change > tolerance else ""
+        ok &= not flag
+        print(f"  {name:<14} p95 {before['p95_ms']:>9.1f} -> {stats['p95_ms']:>9.1f} ms "
+              f"({change:+.0%}){flag}")
+
+    before = baseline.get("throughput_per_s")
+    if before:
+        change = report["throughput_per_s"] / before - 1
+        flag = "  REGRESSION" if change < -tolerance else ""
+        ok &= not flag
+        print(f"  {'throughput':<14} {before:>13.1f} -> {report['throughput_per_s']:>9.1f} /s "
+              f"({change:+.0%}){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=2, help="Guess rounds per player")
+    parser.add_argument("--quizzes", type=int, default=1, help="Quizzes per player")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds per rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative p95/throughput regression")
+    args = parser.parse_args()
+
+    from benchmarks.fake_llm import FakeLLMServer
+
+    llm = FakeLLMServer(
+        ("127.0.0.1", 0), latency=args.llm_latency, jitter=args.llm_jitter,
+        error_rate=args.llm_error_rate, seed=args.seed,
+    ).start()
+    _isolate(tempfile.mkdtemp(prefix="fest-load-"), llm.url)
+    _share_runtime()
+
+    samples = defaultdict(list)
+    errors = defaultdict(list)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    players = [Player(i, args, samples, errors) for i in range(args.players)]
+    start_line = threading.Barrier(len(players))
+
+    def _play(player):
+        start_line.wait()
+        try:
+            player.run()
+        except Exception as e:
+            errors["player"].append(f"{type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=_play, args=(p,)) for p in players]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    from common.session import get_session_registry
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sessions = get_session_registry().stats()
+    interactions = sum(len(v) for v in samples.values())
+
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "config": vars(args),
+        "wall_seconds": round(wall, 2),
+        "interactions_total": interactions,
+        "throughput_per_s": round(interactions / wall, 2) if wall else None,
+        "interactions": {name: _percentiles(v) for name, v in sorted(samples.items()) if v},
+        "errors": {name: {"count": len(v), "first": v[0]} for name, v in errors.items() if v},
+        "memory": {
+            # ru_maxrss is in KiB on Linux
+            "peak_rss_growth_mb": round((rss_after - rss_before) / 1024, 1),
+            "rss_per_session_kb": round((rss_after - rss_before) / max(1, args.players), 1),
+            "accounted_sessions": sessions["sessions"],
+            "accounted_bytes_per_session": (
+                sessions["bytes"] // sessions["sessions"] if sessions["sessions"] else None
+            ),
+        },
+        "llm": llm.stats(),
+    }
+    llm.shutdown()
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if not compare(report, json.load(f), args.tolerance):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Before/after cost of one interaction: full-script rerun vs fragment rerun.
+
+"Before" drives main.py through AppTest, so every guess or quiz Submit
+re-executes the whole script (auth, sidebar, rules, history). "After"
+runs only the fragment body that a fragment-scoped rerun executes. For
+each interaction we report script execution time and the serialized
+size of the elements it sends (the delta bytes).
+
+    python -m benchmarks.rerun_cost --interactions 50
+"""
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("QUIZ_PREWARM", "0")
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_QUESTIONS = [
+    {
+        "question": f"Sample question {i}?",
+        "options": ["Alpha", "Beta", "Gamma"],
+        "answer": "Alpha",
+    }
+    for i in range(200)
+]
+
+
+# ===================== FRAGMENT-ONLY APPS =====================
+def _guess_board():
+    import streamlit as st
+    from Guess_Number.guess_the_number import GuessTheNumber
+
+    game = GuessTheNumber(min_num=1, max_num=100, max_attempts=10**9, reveal_delay=0)
+    st.fragment(game.render_board)()
+
+
+def _quiz_board():
+    import streamlit as st
+
+    st.fragment(st.session_state.quiz.render_board)()
+
+
+# ===================== MEASUREMENT =====================
+def element_bytes(node):
+    """Serialized size of every element proto under ``node``."""
+    total = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        total += proto.ByteSize()
+    for child in getattr(node, "children", {}).values():
+        total += element_bytes(child)
+    return total
+
+
+def _timed_run(at, interact):
+    interact(at)
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    return elapsed, element_bytes(at.main) + element_bytes(at.sidebar)
+
+
+def _guess(at, i):
+    at.number_input(key="gn_input_value").set_value(1 + i % 100)
+    next(b for b in at.button if b.label == "🔍 Check Guess").click()
+
+
+def _answer(at, i):
+    at.button(key=f"submit_{i}").click()
+
+
+def _new_app(full, game):
+    if full:
+        at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=30)
+        at.session_state["authenticated"] = True
+        at.session_state["active_game"] = game
+    else:
+        at = AppTest.from_function(
+            _guess_board if game == "number" else _quiz_board, default_timeout=30
+        )
+
+    if game == "quiz":
+        from interactive_quiz.quiz import InteractiveQuiz
+        at.session_state["quiz"] = InteractiveQuiz(list(SAMPLE_QUESTIONS))
+
+    at.run()
+    if game == "number":
+        # Out-of-range secret and no attempt cap: the round never ends
+        engine = at.session_state["gn_engine"]
+        engine.secret = 0
+        engine.max_attempts = 10**9
+    return at
+
+
+def measure(game, full, interactions):
+    at = _new_app(full, game)
+    interact = _guess if game == "number" else _answer
+    return [_timed_run(at, lambda a: interact(a, i)) for i in range(interactions)]
+
+
+def _summary(samples):
+    times = sorted(t for t, _ in samples)
+    sizes = [b for _, b in samples]
+    return (
+        1000 * sum(times) / len(times),
+        1000 * times[int(0.95 * (len(times) - 1))],
+        sum(sizes) / len(sizes),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interactions", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'game':<8}{'rerun':<10}{'mean ms':>9}{'p95 ms':>9}{'bytes':>10}")
+    for game in ("number", "quiz"):
+        for label, full in (("full", True), ("fragment", False)):
+            mean, p95, size = _summary(measure(game, full, args.interactions))
+            print(f"{game:<8}{label:<10}{mean:9.1f}{p95:9.1f}{size:10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import hmac
+
+import streamlit as st
+
+from common.metrics import FEST_PROFILE, read_expositions, registry
+
+# ===================== ADMIN CONFIG =====================
+# The ops page is served at ?admin=<token>; unset means there is no page
+FEST_ADMIN_TOKEN = os.getenv("FEST_ADMIN_TOKEN", "")
+
+
+def is_admin_request():
+    token = st.query_params.get("admin")
+    return bool(FEST_ADMIN_TOKEN and token) and hmac.compare_digest(token, FEST_ADMIN_TOKEN)
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def render_admin_page():
+    """Latency percentiles and stats of the worker process serving this page."""
+    from common.session import get_session_registry
+
+    # Make sure the session gauges exist even before anyone played
+    get_session_registry()
+
+    st.title("📈 Food Fest Ops")
+    st.caption(
+        f"Worker pid {os.getpid()} · profiling "
+        + ("on" if FEST_PROFILE else "off (start with FEST_PROFILE=1 for spans)")
+    )
+
+    st.subheader("⏱️ Spans")
+    spans = registry.spans()
+    if spans:
+        st.dataframe(
+            [
+                {
+                    "span": name,
+                    "count": snap["count"],
+                    "p50 ms": _ms(snap["p50"]),
+                    "p95 ms": _ms(snap["p95"]),
+                    "p99 ms": _ms(snap["p99"]),
+                    "total s": round(snap["sum"], 3),
+                }
+                for name, snap in spans.items()
+            ],
+            hide_index=True,
+        )
+    else:
+        st.info("No spans recorded yet.")
+
+    st.subheader("📊 Stats")
+    st.dataframe(
+        [
+            {"metric": f"{name}.{key}", "value": value}
+            for name, values in registry.collect().items()
+            for key, value in values.items()
+        ],
+        hide_index=True,
+    )
+
+    with st.expander("Prometheus exposition (all workers)"):
+        st.code(registry.render_prometheus(read_expositions()), language="text")
+
+    if st.button("🔄 Refresh"):
+        st.rerun()
@@ -0,0 +1,253 @@
+"""Structured, buffered event log for the festival games.
+
+``emit`` only appends a tuple to an in-memory ring buffer; a background
+thread drains it every few seconds into gzip-compressed JSON Lines files,
+one series per day and worker process. Summarize a day with:
+
+    python -m common.events --day 20261018
+"""
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import Counter, defaultdict, deque
+
+from common.metrics import register_collector
+
+# ===================== EVENT LOG CONFIG =====================
+EVENT_LOG = os.getenv("EVENT_LOG", "1") == "1"
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", os.path.join("data", "events"))
+# Events kept in memory between flushes; the oldest are dropped beyond this
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "65536"))
+EVENT_FLUSH_INTERVAL = float(os.getenv("EVENT_FLUSH_INTERVAL", "2"))
+# A day's file is continued in a new one past this many compressed bytes
+EVENT_ROTATE_BYTES = int(os.getenv("EVENT_ROTATE_BYTES", str(64 * 1024 * 1024)))
+
+# ===================== EVENT TYPES =====================
+# kind -> the fields every event of that kind carries (and nothing else)
+EVENT_TYPES = {
+    "guess": ("attempt", "direction", "band", "won", "lost"),
+    "answer": ("index", "correct"),
+    "matrix_answer": ("mode", "size", "correct"),
+    "quiz_completed": ("score", "total"),
+    "quiz_generated": ("source", "questions", "latency_ms"),
+    "quiz_failed": ("source", "latency_ms"),
+    "cache_hit": ("tier",),
+}
+_FIELDS = {kind: frozenset(fields) for kind, fields in EVENT_TYPES.items()}
+
+
+# ===================== EVENT LOG =====================
+class EventLog:
+    """Ring buffer of typed events plus the thread that writes them out."""
+
+    def __init__(self, directory=EVENT_LOG_DIR, capacity=EVENT_BUFFER_SIZE,
+                 flush_interval=EVENT_FLUSH_INTERVAL, rotate_bytes=EVENT_ROTATE_BYTES):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()        # guards the counters
+        self._write_lock = threading.Lock()  # one writer at a time
+        self._started = False
+        self._files = {}  # day -> (sequence, path)
+
+        self.emitted = 0
+        self.dropped = 0
+        self.written = 0
+
+    def emit(self, kind, **fields):
+        """Records one event; never blocks on I/O."""
+        expected = _FIELDS.get(kind)
+        if expected is None:
+            raise ValueError(f"Unknown event type {kind!r}")
+        if fields.keys() != expected:
+            raise ValueError(f"{kind} events carry exactly {EVENT_TYPES[kind]}")
+
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append((time.time(), kind, fields))
+            self.emitted += 1
+        if not self._started:
+            self._start()
+
+    def flush(self):
+        """Writes every buffered event; returns how many were written."""
+        with self._write_lock:
+            with self._lock:
+                records = list(self._buffer)
+                self._buffer.clear()
+            if not records:
+                return 0
+
+            by_day = defaultdict(list)
+            for ts, kind, fields in records:
+                line = json.dumps(
+                    {"t": round(ts, 3), "e": kind, **fields}, separators=(",", ":")
+                )
+                by_day[time.strftime("%Y%m%d", time.localtime(ts))].append(line)
+
+            os.makedirs(self.directory, exist_ok=True)
+            for day, lines in by_day.items():
+                # Each flush appends one gzip member; readers see one stream
+                with gzip.open(self._path(day), "at", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+            with self._lock:
+                self.written += len(records)
+            return len(records)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "emitted": self.emitted,
+                "dropped": self.dropped,
+                "written": self.written,
+            }
+
+    # ----- internals -----
+    def _path(self, day):
+        sequence, path = self._files.get(day, (0, None))
+        if path is None or (
+            os.path.exists(path) and os.path.getsize(path) >= self.rotate_bytes
+        ):
+            while True:
+                sequence += 1
+                path = os.path.join(
+                    self.directory, f"events-{day}-{os.getpid()}-{sequence:03d}.jsonl.gz"
+                )
+                if not os.path.exists(path) or os.path.getsize(path) < self.rotate_bytes:
+                    break
+            self._files[day] = (sequence, path)
+        return path
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="event-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass  # Disk trouble must not take the games down
+
+
+class _NullEventLog:
+    """Stand-in when EVENT_LOG=0: events are discarded."""
+
+    def emit(self, kind, **fields):
+        pass
+
+    def flush(self):
+        return 0
+
+    def stats(self):
+        return {}
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """Returns the process-wide event log, creating it on first use."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = EventLog() if EVENT_LOG else _NullEventLog()
+                register_collector("events", _log.stats)
+    return _log
+
+
+def emit(kind, **fields):
+    get_event_log().emit(kind, **fields)
+
+
+# ===================== READER =====================
+def read_events(day, directory=EVENT_LOG_DIR):
+    """Yields the events of ``day`` (YYYYMMDD) from every worker's files."""
+    for path in sorted(glob.glob(os.path.join(directory, f"events-{day}-*.jsonl.gz"))):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, ValueError):
+            continue  # A member cut short by a crash; the rest of the file is lost
+
+
+def _percentiles(samples):
+    if not samples:
+        return None
+    samples.sort()
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def aggregate(events):
+    """One-pass summary of an event stream."""
+    counts = Counter()
+    guesses = Counter()
+    answers = Counter()
+    hits = Counter()
+    latencies = defaultdict(list)
+    failures = Counter()
+
+    for event in events:
+        kind = event["e"]
+        counts[kind] += 1
+        if kind == "guess":
+            guesses["won" if event["won"] else "lost" if event["lost"] else "open"] += 1
+        elif kind == "answer":
+            answers[bool(event["correct"])] += 1
+        elif kind == "cache_hit":
+            hits[event["tier"]] += 1
+        elif kind == "quiz_generated":
+            latencies[event["source"]].append(event["latency_ms"])
+        elif kind == "quiz_failed":
+            failures[event["source"]] += 1
+
+    rounds = guesses["won"] + guesses["lost"]
+    answered = answers[True] + answers[False]
+    return {
+        "events": dict(counts),
+        "guess_rounds": rounds,
+        "guess_win_rate": guesses["won"] / rounds if rounds else None,
+        "answers": answered,
+        "answer_accuracy": answers[True] / answered if answered else None,
+        "cache_hits": dict(hits),
+        "generation_ms": {src: _percentiles(v) for src, v in latencies.items()},
+        "generation_failures": dict(failures),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a day of game events.")
+    parser.add_argument("--day", default=time.strftime("%Y%m%d"), help="YYYYMMDD")
+    parser.add_argument("--dir", default=EVENT_LOG_DIR)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = aggregate(read_events(args.day, args.dir))
+    summary["read_seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import os
+import time
+import atexit
+import bisect
+import sqlite3
+import threading
+
+from common.sqlite import ProcessWide, connect
+
+# ===================== LEADERBOARD CONFIG =====================
+LEADERBOARD_PATH = os.getenv(
+    "LEADERBOARD_PATH", os.path.join("data", "leaderboard.sqlite3")
+)
+LEADERBOARD_TOP_K = int(os.getenv("LEADERBOARD_TOP_K", "10"))
+# Queued results are inserted in one transaction this often
+LEADERBOARD_FLUSH_INTERVAL = float(os.getenv("LEADERBOARD_FLUSH_INTERVAL", "1"))
+# Results from other worker processes show up after at most this long
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "5"))
+
+# game -> True when a higher score ranks first (quiz points), False when
+# a lower one does (guesses needed to find the number). Higher-first games
+# rank by score / total, so a perfect 5/5 beats 60/100 whatever the quiz
+# length; of two equal shares the longer quiz goes first.
+GAMES = {"quiz": True, "number": False}
+
+# The ranking expression, shared by the index and the top-K query
+_SHARE = "(CAST(score AS REAL) / total)"
+
+MAX_NAME_LENGTH = 24
+
+
+def clean_name(name):
+    """Player name safe to show in a markdown table."""
+    name = " ".join(str(name or "").replace("|", " ").split())[:MAX_NAME_LENGTH]
+    return name or "Guest"
+
+
+# ===================== LEADERBOARD =====================
+class Leaderboard:
+    """Festival-wide rankings per game.
+
+    Every result is kept in SQLite, indexed on (game, score, created_at)
+    in both score directions, so the best K of a game are an index range
+    scan. Reads never touch
+    the database: each game's top K live in a sorted in-memory list that
+    ``submit`` updates immediately. A writer thread inserts queued results
+    in batches and periodically reloads the top K to pick up results
+    recorded by other worker processes.
+    """
+
+    def __init__(self, path=LEADERBOARD_PATH, top_k=LEADERBOARD_TOP_K,
+                 flush_interval=LEADERBOARD_FLUSH_INTERVAL,
+                 refresh_interval=LEADERBOARD_REFRESH_SECONDS):
+        self.path = path
+        self.top_k = top_k
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()      # guards the queue and the top K
+        self._db_lock = threading.Lock()   # guards the connection
+        self._pending = []  # (game, player, score, total, created_at)
+        self._top = {}      # game -> sorted [(rank, created_at, player, score, total)]
+        self._wake = threading.Event()
+
+        self.submitted = 0
+        self.written = 0
+        self.flushes = 0
+
+        self._db = self._connect(path)
+        for game in GAMES:
+            self._top[game] = self._load_top(game)
+
+        threading.Thread(target=self._run, name="leaderboard-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " id INTEGER PRIMARY KEY,"
+            " game TEXT NOT NULL,"
+            " player TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " total INTEGER,"
+            " created_at REAL NOT NULL)",
+            # One index per ranking order, so neither top-K query has to
+            # sort a large group of tied scores by time
+            "CREATE INDEX IF NOT EXISTS scores_rank"
+            " ON scores (game, score, created_at)",
+            "CREATE INDEX IF NOT EXISTS scores_rank_share"
+            f" ON scores (game, {_SHARE} DESC, total DESC, created_at)",
+            "DROP INDEX IF EXISTS scores_rank_desc",
+        )
+
+    # ----- writes -----
+    def submit(self, game, player, score, total=None):
+        """Records a result; returns at once, the insert happens in the background."""
+        if game not in GAMES:
+            raise ValueError(f"Unknown game {game!r}")
+
+        row = (game, clean_name(player), score, total, time.time())
+        with self._lock:
+            self._pending.append(row)
+            self._offer(row)
+            self.submitted += 1
+
+    def flush(self):
+        """Inserts every queued result now."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    "INSERT INTO scores (game, player, score, total, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    batch,
+                )
+        except sqlite3.Error:
+            with self._lock:
+                self._pending[:0] = batch  # Retried on the next tick
+            raise
+
+        with self._lock:
+            self.written += len(batch)
+            self.flushes += 1
+
+    # ----- reads -----
+    def top(self, game, limit=None):
+        """Best results of ``game`` as (player, score, total, created_at) tuples."""
+        with self._lock:
+            entries = self._top.get(game, ())[:limit or self.top_k]
+        return [(player, score, total, at) for _, at, player, score, total in entries]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "submitted": self.submitted,
+                "written": self.written,
+                "flushes": self.flushes,
+            }
+
+    # ----- internals -----
+    def _entry(self, row):
+        game, player, score, total, created_at = row
+        # Ties go to whoever got there first
+        rank = (-score / (total or 1), -(total or 0)) if GAMES[game] else (score,)
+        return (rank, created_at, player, score, total)
+
+    def _offer(self, row):
+        """Inserts ``row`` into its game's top K (caller holds the lock)."""
+        entries = self._top[row[0]]
+        entry = self._entry(row)
+        if len(entries) >= self.top_k and entry >= entries[-1]:
+            return
+        bisect.insort(entries, entry)
+        del entries[self.top_k:]
+
+    def _load_top(self, game):
+        order = f"{_SHARE} DESC, total DESC" if GAMES[game] else "score ASC"
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT game, player, score, total, created_at FROM scores"
+                f" WHERE game = ? ORDER BY {order}, created_at LIMIT ?",
+                (game, self.top_k),
+            ).fetchall()
+        return sorted(self._entry(row) for row in rows)
+
+    def _refresh(self):
+        loaded = {game: self._load_top(game) for game in GAMES}
+        with self._lock:
+            for game, entries in loaded.items():
+                self._top[game] = entries
+            # Results still queued are not in the database yet
+            for row in self._pending:
+                self._offer(row)
+
+    def _run(self):
+        next_refresh = time.monotonic() + self.refresh_interval
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() >= next_refresh:
+                    self._refresh()
+                    next_refresh = time.monotonic() + self.refresh_interval
+            except sqlite3.Error:
+                pass  # Locked by another worker; try again next tick
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_leaderboard = ProcessWide("leaderboard", Leaderboard)
+
+
+def get_leaderboard():
+    """Returns the process-wide leaderboard, creating it on first use."""
+    return _leaderboard.get()
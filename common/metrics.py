@@ -0,0 +1,290 @@
+"""Opt-in timing spans, latency histograms and a Prometheus text exposition.
+
+Spans are off unless FEST_PROFILE=1; then ``span``/``timed`` return shared
+no-op objects or the undecorated function, so instrumented code costs a
+function call at most.
+
+    with span("guess.audio"):
+        ...
+
+    @timed("quiz.display_question")
+    def display_question(self): ...
+
+Stats collectors (sessions, caches, leaderboard, ...) are always exported.
+Streamlit cannot serve extra routes, so every process writes its samples
+to FEST_METRICS_DIR; the API's /metrics serves them all.
+"""
+import os
+import glob
+import time
+import bisect
+import functools
+import threading
+from collections import deque
+
+# ===================== METRICS CONFIG =====================
+FEST_PROFILE = os.getenv("FEST_PROFILE", "0") == "1"
+FEST_METRICS_DIR = os.getenv("FEST_METRICS_DIR", os.path.join("data", "metrics"))
+# How often each process rewrites its exposition file (0 disables)
+FEST_METRICS_DUMP_SECONDS = float(os.getenv("FEST_METRICS_DUMP_SECONDS", "15"))
+# Recent samples per span kept for the percentiles
+FEST_METRICS_WINDOW = int(os.getenv("FEST_METRICS_WINDOW", "2048"))
+
+SPAN_METRIC = "fest_span_seconds"
+BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+# ===================== HISTOGRAM =====================
+class Histogram:
+    """Prometheus-style cumulative buckets plus a window for percentiles."""
+
+    def __init__(self, buckets=BUCKETS, window=FEST_METRICS_WINDOW):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(buckets) + 1)
+        self._recent = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._recent.append(seconds)
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            recent = sorted(self._recent)
+            count, total = self.count, self.sum
+
+        pick = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] if recent else None
+        return {
+            "count": count,
+            "sum": total,
+            "counts": counts,
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+        }
+
+
+# ===================== SPANS =====================
+class _Span:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.started = time.perf_counter()
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
+        return False
+
+    def end(self):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def end(self):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRegistry:
+    """Span histograms and stats collectors of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._collectors = {}
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram())
+        return histogram
+
+    def register_collector(self, name, stats):
+        """Exports the numeric values of ``stats()`` as ``fest_<name>_<key>``."""
+        with self._lock:
+            self._collectors[name] = stats
+
+    def spans(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: h.snapshot() for name, h in sorted(histograms.items())}
+
+    def collect(self):
+        with self._lock:
+            collectors = dict(self._collectors)
+
+        values = {}
+        for name, stats in sorted(collectors.items()):
+            try:
+                values[name] = {
+                    key: value for key, value in stats().items()
+                    if isinstance(value, (int, float)) and not isinstance(value, bool)
+                }
+            except Exception:
+                continue  # A failing collector must not break the endpoint
+        return values
+
+    # ----- exposition -----
+    def render_samples(self):
+        """Sample lines of this process, labelled with its pid (no comments)."""
+        pid = os.getpid()
+        lines = []
+        for name, snap in self.spans().items():
+            labels = f'span="{name}",pid="{pid}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, snap["counts"]):
+                cumulative += count
+                lines.append(f'{SPAN_METRIC}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{SPAN_METRIC}_bucket{{{labels},le="+Inf"}} {snap["count"]}')
+            lines.append(f"{SPAN_METRIC}_sum{{{labels}}} {snap['sum']:.6f}")
+            lines.append(f"{SPAN_METRIC}_count{{{labels}}} {snap['count']}")
+
+        for name, values in self.collect().items():
+            for key, value in values.items():
+                lines.append(f'fest_{name}_{key}{{pid="{pid}"}} {value}')
+        return lines
+
+    def render_prometheus(self, others=()):
+        """Text exposition of this process plus ``others`` (dumped sample texts).
+
+        Samples are regrouped per metric family so each family gets one
+        TYPE line, however many processes reported it.
+        """
+        samples = self.render_samples()
+        for text in others:
+            samples.extend(l for l in text.splitlines() if l and not l.startswith("#"))
+
+        families = {}
+        for line in samples:
+            families.setdefault(_family(line), []).append(line)
+
+        out = []
+        for (family, kind), lines in sorted(families.items()):
+            out.append(f"# TYPE {family} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+    def dump(self, directory=FEST_METRICS_DIR):
+        """Atomically rewrites this process's sample file."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics-{os.getpid()}.prom")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.render_samples()) + "\n")
+        os.replace(tmp, path)
+
+
+def _family(line):
+    name = line.split("{", 1)[0].split(" ", 1)[0]
+    if name.startswith(SPAN_METRIC):
+        return SPAN_METRIC, "histogram"
+    return name, "gauge"
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+registry = MetricsRegistry()
+
+
+def span(name):
+    """Times a ``with`` block under ``name`` (a no-op unless profiling)."""
+    if not FEST_PROFILE:
+        return _NULL_SPAN
+    return _Span(registry.histogram(name))
+
+
+def start_span(name):
+    """Like ``span`` for code that cannot be indented; call ``.end()``."""
+    return span(name)
+
+
+def timed(name):
+    """Decorator form of ``span``; leaves the function untouched when off."""
+    def decorate(fn):
+        if not FEST_PROFILE:
+            return fn
+
+        histogram = registry.histogram(name)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def register_collector(name, stats):
+    registry.register_collector(name, stats)
+
+
+# ===================== EXPOSITION FILES =====================
+_dumping = False
+_dump_lock = threading.Lock()
+
+
+def start_metrics_dump(interval=FEST_METRICS_DUMP_SECONDS):
+    """Rewrites this process's exposition file every ``interval`` seconds."""
+    global _dumping
+    if interval <= 0:
+        return
+    with _dump_lock:
+        if _dumping:
+            return
+        _dumping = True
+
+    def _run():
+        while True:
+            time.sleep(interval)
+            try:
+                registry.dump()
+            except OSError:
+                pass
+
+    threading.Thread(target=_run, name="metrics-dump", daemon=True).start()
+
+
+def read_expositions(directory=FEST_METRICS_DIR, max_age=None):
+    """Sample texts written by other processes, skipping stale ones."""
+    max_age = max_age or 4 * max(FEST_METRICS_DUMP_SECONDS, 1)
+    now = time.time()
+    texts = []
+    for path in sorted(glob.glob(os.path.join(directory, "metrics-*.prom"))):
+        if path.endswith(f"-{os.getpid()}.prom"):
+            continue  # This process is rendered live
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                continue
+            with open(path, encoding="utf-8") as f:
+                texts.append(f.read())
+        except OSError:
+            continue
+    return texts
@@ -0,0 +1,283 @@
+import os
+import re
+import sys
+import time
+import zlib
+import secrets
+import threading
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from common.metrics import register_collector, timed
+from common.state_store import decode_state, encode_state, get_state_store
+from Guess_Number.engine import GuessEngine
+from Memory_Matrix.engine import MatrixEngine
+from interactive_quiz.cache import get_quiz_cache
+
+# ===================== SESSION IDENTITY =====================
+# The id rides in the URL (?sid=...), so a reload, a restarted server or
+# another worker behind the load balancer all find the same game. Only
+# the server issues ids, and the login is never part of the saved state:
+# a URL brings back a game, not access.
+SESSION_PARAM = "sid"
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+# Bump when the snapshot layout changes; older snapshots are ignored
+_STATE_VERSION = 2
+
+# ===================== IDLE SESSIONS =====================
+# A session not seen for this long no longer counts as live in the
+# session stats. 0 turns the accounting off. The registry never holds a
+# session's state: Streamlit frees a closed tab shortly after it
+# disconnects, and its games stay archived in the state store.
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", str(30 * 60)))
+
+
+def session_id():
+    """Stable id of this browser session, issued on its first run.
+
+    A ``?sid=`` from the URL is adopted only when the state store holds a
+    session under it; an unknown one starts a new session.
+    """
+    sid = st.session_state.get("_sid")
+    if sid is None:
+        sid = st.query_params.get(SESSION_PARAM)
+        if not _known_session(sid):
+            sid = secrets.token_urlsafe(16)
+            st.query_params[SESSION_PARAM] = sid
+        st.session_state._sid = sid
+    return sid
+
+
+def _known_session(sid):
+    if not sid or not _SESSION_ID.match(sid):
+        return False
+    store = get_state_store()
+    return store is not None and store.load(sid) is not None
+
+
+# ===================== SNAPSHOTS =====================
+def _snapshot(state):
+    """Compact, JSON-able copy of the game state worth keeping."""
+    data = {
+        "v": _STATE_VERSION,
+        "game": state.get("active_game"),
+        "name": state.get("player_name", ""),
+        "seen": {k: sorted(v) for k, v in state.get("quiz_seen", {}).items()},
+        "scored": sorted(state.get("quiz_scored", ())),
+    }
+
+    engine = state.get("gn_engine")
+    if engine is not None:
+        data["gn"] = {
+            "e": engine.to_state(),
+            "f": state.get("gn_feedback", ""),
+            "h": list(state.get("gn_history", ())),
+        }
+
+    matrix = state.get("mm_engine")
+    if matrix is not None:
+        # The seed stands in for the grid, whatever its size
+        data["mm"] = {"e": matrix.to_state(), "l": state.get("mm_last")}
+
+    quiz = state.get("quiz")
+    # A quiz still streaming in is kept only once all its questions arrived
+    if quiz is not None and not quiz.loading and quiz.questions:
+        if quiz.set_id is None:
+            quiz.set_id = get_quiz_cache().store_set(list(quiz.questions))
+        data["qz"] = {
+            "q": quiz.set_id, "e": quiz.engine.to_state(), "r": int(quiz.recorded),
+        }
+
+    return data
+
+
+def _apply(data, state):
+    # The game views import this module; load them only when restoring
+    from Guess_Number.guess_the_number import new_history
+    from interactive_quiz.quiz import InteractiveQuiz
+
+    state["active_game"] = data["game"]
+    state["player_name"] = data.get("name", "")
+    state["quiz_seen"] = {k: set(v) for k, v in data["seen"].items()}
+    state["quiz_scored"] = set(data.get("scored", ()))
+
+    gn = data.get("gn")
+    if gn is not None:
+        engine = GuessEngine.from_state(gn["e"])
+        state["gn_engine"] = engine
+        state["gn_feedback"] = gn["f"]
+        state["gn_history"] = new_history(gn["h"])
+        state["gn_input_value"] = engine.min_num
+
+    mm = data.get("mm")
+    if mm is not None:
+        state["mm_engine"] = MatrixEngine.from_state(mm["e"])
+        state["mm_last"] = mm["l"]
+
+    qz = data.get("qz")
+    if qz is not None:
+        questions = get_quiz_cache().load_set(qz["q"])
+        if questions is not None:
+            quiz = InteractiveQuiz(questions)
+            quiz.engine.load_state(qz["e"])
+            quiz.set_id = qz["q"]
+            quiz.recorded = bool(qz["r"])
+            state["quiz"] = quiz
+
+
+# ===================== RESTORE / PERSIST =====================
+def restore_session():
+    """Loads this session's saved state, once, on its first script run."""
+    state = st.session_state
+    if state.get("_state_restored"):
+        return
+    state._state_restored = True
+
+    store = get_state_store()
+    if store is None:
+        return
+
+    blob = store.load(session_id())
+    try:
+        data = decode_state(blob)
+    except (ValueError, zlib.error):
+        data = None
+    if not data or data.get("v") != _STATE_VERSION:
+        return
+
+    _apply(data, state)
+    state._state_blob = blob
+
+
+@timed("session.persist")
+def persist_session():
+    """Queues a save of the current state when it changed since the last one.
+
+    Called once per run: by main.py after a full run, and by the game's
+    fragment after a fragment-only rerun. The store batches the actual
+    writes off the UI thread. Also marks the session as active and
+    re-measures its memory when the state changed.
+    """
+    state = st.session_state
+    if not state.get("_state_restored"):
+        return
+
+    blob = encode_state(_snapshot(state))
+    changed = blob != state.get("_state_blob")
+    get_session_registry().touch(session_id(), measure=changed)
+    if not changed:
+        return
+
+    state._state_blob = blob
+    store = get_state_store()
+    if store is not None:
+        store.save(session_id(), blob)
+
+
+# ===================== MEMORY ACCOUNTING =====================
+# Attributes pointing into other sessions' objects (a streaming quiz's
+# followers), which are counted with those sessions
+_SHARED_ATTRS = frozenset({"_followers"})
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes reachable from ``obj`` (containers, objects, slots)."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+
+    # Plain objects: their attribute dict and/or slots, but not locks or threads
+    if isinstance(obj, (threading.Thread, type(threading.Lock()))):
+        return size
+    if hasattr(obj, "__dict__"):
+        attrs = vars(obj)
+        if _SHARED_ATTRS.intersection(attrs):
+            attrs = {k: v for k, v in attrs.items() if k not in _SHARED_ATTRS}
+        size += deep_sizeof(attrs, seen)
+    for name in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, name):
+            size += deep_sizeof(getattr(obj, name), seen)
+    return size
+
+
+class SessionRegistry:
+    """Live sessions of this process: last activity and approximate bytes.
+
+    Only numbers are kept per session (never a reference to its state),
+    so the registry cannot keep a closed tab alive. Sessions idle for
+    ``idle_timeout`` seconds drop out of the stats.
+    """
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        # session_id -> [id of its SessionState, last_seen, bytes]
+        self._sessions = {}
+
+    def touch(self, sid, measure=False):
+        """Marks the running session active; ``measure`` re-counts its bytes."""
+        if self.idle_timeout <= 0:
+            return
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return
+        # The thread-safe wrapper is rebuilt per script runner; the wrapped
+        # SessionState lives as long as the browser session does
+        state = getattr(ctx.session_state, "_state", ctx.session_state)
+
+        with self._lock:
+            entry = self._sessions.get(sid)
+        if entry is None or entry[0] != id(state):
+            measure = True
+
+        size = entry[2] if entry is not None else 0
+        if measure:
+            seen = set()
+            size = sum(
+                deep_sizeof(value, seen) for value in state.filtered_state.values()
+            )
+
+        with self._lock:
+            self._sessions[sid] = [id(state), time.monotonic(), size]
+
+    def stats(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            # Idle entries are only bookkeeping; drop them here
+            for sid in [s for s, e in self._sessions.items() if e[1] < cutoff]:
+                del self._sessions[sid]
+            return {
+                "sessions": len(self._sessions),
+                "bytes": sum(e[2] for e in self._sessions.values()),
+            }
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_session_registry():
+    """Returns the process-wide session registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SessionRegistry()
+                register_collector("sessions", _registry.stats)
+    return _registry
@@ -0,0 +1,50 @@
+"""SQLite plumbing shared by the on-disk stores.
+
+Every store opens its file the same way (WAL, ``synchronous=NORMAL``, one
+connection shared with its writer thread) and lives as one lazily created
+process-wide instance whose stats are exported:
+
+    _leaderboard = ProcessWide("leaderboard", Leaderboard)
+
+    def get_leaderboard():
+        return _leaderboard.get()
+"""
+import os
+import sqlite3
+import threading
+
+from common.metrics import register_collector
+
+
+def connect(path, *schema):
+    """Opens ``path`` in WAL mode, creating its directory, and runs ``schema``."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    for statement in schema:
+        db.execute(statement)
+    db.commit()
+    return db
+
+
+class ProcessWide:
+    """Builds ``factory()`` on first ``get`` and registers its stats as ``name``."""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    instance = self.factory()
+                    register_collector(self.name, instance.stats)
+                    self._instance = instance
+        return self._instance
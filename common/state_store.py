@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import zlib
+import atexit
+import sqlite3
+import threading
+
+from common.sqlite import ProcessWide, connect
+
+# ===================== STATE STORE CONFIG =====================
+# "sqlite" (default), "memory" (single process, lost on restart) or "off"
+STATE_BACKEND = os.getenv("STATE_BACKEND", "sqlite").lower()
+STATE_DB_PATH = os.getenv(
+    "STATE_DB_PATH", os.path.join("data", "session_state.sqlite3")
+)
+# Saves are coalesced per session and written in one transaction this often
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", "0.25"))
+
+# Blobs smaller than this are stored as plain JSON
+_COMPRESS_MIN = 512
+_PLAIN, _ZLIB = b"j", b"z"
+
+
+# ===================== SERIALIZATION =====================
+def encode_state(state):
+    """Compact bytes for a JSON-able state dict (zlib for larger ones)."""
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    if len(raw) < _COMPRESS_MIN:
+        return _PLAIN + raw
+    return _ZLIB + zlib.compress(raw, 1)
+
+
+def decode_state(blob):
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    raw = zlib.decompress(blob[1:]) if blob[:1] == _ZLIB else blob[1:]
+    return json.loads(raw)
+
+
+# ===================== INTERFACE =====================
+class StateStore:
+    """Key-value store of encoded session state, keyed by session id.
+
+    Backends only move opaque bytes, so a Redis-like server implements it
+    as ``GET``/``SET``/``DEL`` on the session id.
+    """
+
+    def load(self, session_id):
+        """Returns the stored blob for ``session_id`` or ``None``."""
+        raise NotImplementedError
+
+    def save(self, session_id, blob):
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def flush(self, timeout=5):
+        """Waits until earlier saves are durable; True once they are."""
+        return True
+
+    def stats(self):
+        return {}
+
+
+class MemoryStateStore(StateStore):
+    """Process-local backend; state survives reruns but not restarts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def load(self, session_id):
+        with self._lock:
+            return self._data.get(session_id)
+
+    def save(self, session_id, blob):
+        with self._lock:
+            self._data[session_id] = blob
+
+    def delete(self, session_id):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._data)}
+
+
+class SQLiteStateStore(StateStore):
+    """SQLite backend shared by every worker process on the box.
+
+    ``save`` only parks the blob in memory; a writer thread coalesces the
+    latest blob per session and writes them in one WAL transaction every
+    ``flush_interval`` seconds, so reruns never wait on the disk.
+    """
+
+    def __init__(self, path=STATE_DB_PATH, flush_interval=STATE_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()       # guards the pending map
+        self._db_lock = threading.Lock()    # guards the connection
+        self._pending = {}                  # session_id -> blob (None deletes)
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self.loads = 0
+        self.saves = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+        self._db = self._connect(path)
+        threading.Thread(target=self._run, name="state-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS session_state ("
+            " session_id TEXT PRIMARY KEY,"
+            " state BLOB NOT NULL,"
+            " updated_at REAL NOT NULL)",
+        )
+
+    # ----- interface -----
+    def load(self, session_id):
+        with self._lock:
+            self.loads += 1
+            if session_id in self._pending:
+                return self._pending[session_id]
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT state FROM session_state WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def save(self, session_id, blob):
+        self._park(session_id, blob)
+
+    def delete(self, session_id):
+        self._park(session_id, None)
+
+    def flush(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self._wake.set()
+            if self._idle.wait(0.05):
+                with self._lock:
+                    if not self._pending:
+                        return True
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "loads": self.loads,
+                "saves": self.saves,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+            }
+
+    # ----- writer -----
+    def _park(self, session_id, blob):
+        with self._lock:
+            self._pending[session_id] = blob
+            self.saves += 1
+            self._idle.clear()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._write_batch()
+            except sqlite3.Error:
+                pass  # The batch stays pending and is retried next tick
+
+    def _write_batch(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            self._idle.set()
+            return
+
+        now = time.time()
+        upserts = [(sid, blob, now) for sid, blob in batch.items() if blob is not None]
+        deletes = [(sid,) for sid, blob in batch.items() if blob is None]
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?)", upserts
+                )
+                self._db.executemany(
+                    "DELETE FROM session_state WHERE session_id = ?", deletes
+                )
+        except sqlite3.Error:
+            with self._lock:
+                # Newer saves made during the failed write win
+                for sid, blob in batch.items():
+                    self._pending.setdefault(sid, blob)
+            raise
+
+        with self._lock:
+            self.flushes += 1
+            self.rows_written += len(batch)
+            if not self._pending:
+                self._idle.set()
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+def _new_store():
+    if STATE_BACKEND == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore()
+
+
+_store = ProcessWide("state_store", _new_store)
+
+
+def get_state_store():
+    """Returns the configured state store, or ``None`` when it is switched off."""
+    if STATE_BACKEND == "off":
+        return None
+    return _store.get()
@@ -0,0 +1,38 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+def rerun_fragment():
+    """Reruns the current fragment, or the whole app outside a fragment rerun.
+
+    ``st.rerun(scope="fragment")`` is only valid while a fragment is being
+    rerun on its own; on a full script run (first render, AppTest) the
+    same code path has to fall back to an app rerun.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+def is_fragment_rerun():
+    """Whether only fragments (not the whole script) are running this time."""
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def render_leaderboard(container, game, title, score_label, limit=None):
+    """One markdown table of the best results of ``game`` (no database reads)."""
+    from common.leaderboard import get_leaderboard
+
+    rows = get_leaderboard().top(game, limit)
+    if not rows:
+        container.markdown(f"**{title}**\n\n_No results yet. Be the first!_")
+        return
+
+    lines = [f"**{title}**", "", f"| # | Player | {score_label} |", "|---|---|---|"]
+    for rank, (player, score, total, _) in enumerate(rows, 1):
+        shown = f"{score}/{total}" if total else f"{score}"
+        lines.append(f"| {rank} | {player} | {shown} |")
+    container.markdown("\n".join(lines))
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from common.sqlite import ProcessWide, connect
+from interactive_quiz.validation import normalize_topic, validate_questions
+
+# ===================== CACHE CONFIG =====================
+QUIZ_CACHE_PATH = os.getenv(
+    "QUIZ_CACHE_PATH", os.path.join("data", "quiz_cache.sqlite3")
+)
+QUIZ_CACHE_SIZE = int(os.getenv("QUIZ_CACHE_SIZE", "256"))
+QUIZ_CACHE_TTL = float(os.getenv("QUIZ_CACHE_TTL", str(6 * 60 * 60)))
+
+
+def cache_key(topic, count):
+    """One entry per topic and quiz length."""
+    return f"{normalize_topic(topic)}#{count}"
+
+
+# ===================== QUIZ CACHE =====================
+class QuizCache:
+    """Topic-keyed cache of validated question sets.
+
+    A size-bounded LRU with TTL lives in process memory; a SQLite file
+    behind it survives restarts and is shared by every worker process.
+    """
+
+    def __init__(self, path=QUIZ_CACHE_PATH, max_entries=QUIZ_CACHE_SIZE,
+                 ttl=QUIZ_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (expires_at, questions)
+        self._sets = OrderedDict()    # set_id -> questions
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db = self._connect(path) if path else None
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS quiz_cache ("
+            " topic_key TEXT PRIMARY KEY,"
+            " questions TEXT NOT NULL,"
+            " created_at REAL NOT NULL)",
+            "CREATE TABLE IF NOT EXISTS quiz_sets ("
+            " set_id TEXT PRIMARY KEY,"
+            " questions TEXT NOT NULL,"
+            " created_at REAL NOT NULL)",
+        )
+
+    # ----- lookups -----
+    def get(self, topic, count):
+        """Returns the cached ``count``-question set for ``topic`` or ``None``."""
+        key = cache_key(topic, count)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, questions = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return list(questions)
+                del self._memory[key]
+                self.expirations += 1
+
+            loaded = self._load(key, now)
+            if loaded is None:
+                self.misses += 1
+                return None
+
+            questions, created_at = loaded
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, questions, created_at)
+            return list(questions)
+
+    def put(self, topic, count, questions):
+        """Stores a complete ``count``-question set for ``topic``.
+
+        Short or invalid sets are ignored: a 97-question set cached under
+        "#97" would never be asked for.
+        """
+        if len(questions) != count or not validate_questions(questions):
+            return False
+
+        key = cache_key(topic, count)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, questions, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO quiz_cache VALUES (?, ?, ?)",
+                    (key, json.dumps(questions), now),
+                )
+                self._db.commit()
+        return True
+
+    # ----- question sets by content id (API clients refer to these) -----
+    def store_set(self, questions):
+        """Persists a validated set and returns its content-derived id."""
+        if not validate_questions(questions):
+            raise ValueError("Refusing to store an invalid question set")
+
+        blob = json.dumps(questions, sort_keys=True, separators=(",", ":"))
+        set_id = hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+        with self._lock:
+            if set_id not in self._sets:
+                self._remember_set(set_id, questions)
+                if self._db is not None:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO quiz_sets VALUES (?, ?, ?)",
+                        (set_id, blob, time.time()),
+                    )
+                    self._db.commit()
+        return set_id
+
+    def load_set(self, set_id):
+        """Returns the set stored under ``set_id`` or ``None``."""
+        with self._lock:
+            questions = self._sets.get(set_id)
+            if questions is not None:
+                self._sets.move_to_end(set_id)
+                return questions
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT questions FROM quiz_sets WHERE set_id = ?", (set_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            questions = json.loads(row[0])
+            self._remember_set(set_id, questions)
+            return questions
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # ----- internals (caller holds the lock) -----
+    def _remember(self, key, questions, created_at):
+        self._memory[key] = (created_at + self.ttl, list(questions))
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _remember_set(self, set_id, questions):
+        self._sets[set_id] = questions
+        while len(self._sets) > self.max_entries:
+            self._sets.popitem(last=False)
+
+    def _load(self, key, now):
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT questions, created_at FROM quiz_cache WHERE topic_key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        questions, created_at = row
+        if created_at + self.ttl <= now:
+            self._db.execute("DELETE FROM quiz_cache WHERE topic_key = ?", (key,))
+            self._db.commit()
+            self.expirations += 1
+            return None
+
+        questions = json.loads(questions)
+        if not validate_questions(questions):
+            return None
+        return questions, created_at
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_cache = ProcessWide("quiz_cache", QuizCache)
+
+
+def get_quiz_cache():
+    """Returns the process-wide quiz cache, creating it on first use."""
+    return _cache.get()
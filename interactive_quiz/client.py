@@ -0,0 +1,202 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ================== IMPORTANT ==================
+# Disable CrewAI telemetry (fixes SIGTERM issue)
+os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+
+import httpx
+import litellm
+from crewai import Agent, Task, Crew
+from crewai.llm import LLM
+
+from common.metrics import register_collector
+from interactive_quiz.coalescing import QUIZ_LLM_MAX_CONCURRENCY
+from interactive_quiz.prompts import (
+    AGENT_BACKSTORY,
+    AGENT_GOAL,
+    AGENT_ROLE,
+    EXPECTED_OUTPUT,
+    QUIZ_MODEL,
+)
+
+# ===================== CLIENT CONFIG =====================
+QUIZ_LLM_CONNECT_TIMEOUT = float(os.getenv("QUIZ_LLM_CONNECT_TIMEOUT", "5"))
+QUIZ_LLM_READ_TIMEOUT = float(os.getenv("QUIZ_LLM_READ_TIMEOUT", "90"))
+QUIZ_LLM_KEEPALIVE = int(os.getenv("QUIZ_LLM_KEEPALIVE", "20"))
+
+# Hedging: fire a backup call once the primary is slower than this percentile
+QUIZ_HEDGE_PERCENTILE = float(os.getenv("QUIZ_HEDGE_PERCENTILE", "0.95"))
+QUIZ_HEDGE_MIN_SAMPLES = int(os.getenv("QUIZ_HEDGE_MIN_SAMPLES", "20"))
+QUIZ_HEDGE_DEFAULT_DELAY = float(os.getenv("QUIZ_HEDGE_DEFAULT_DELAY", "20"))
+
+
+def http_timeout():
+    return httpx.Timeout(QUIZ_LLM_READ_TIMEOUT, connect=QUIZ_LLM_CONNECT_TIMEOUT)
+
+
+def _configure_http():
+    """One keep-alive connection pool shared by every litellm call."""
+    if litellm.client_session is None:
+        litellm.client_session = httpx.Client(
+            timeout=http_timeout(),
+            limits=httpx.Limits(
+                max_connections=QUIZ_LLM_KEEPALIVE,
+                max_keepalive_connections=QUIZ_LLM_KEEPALIVE,
+            ),
+        )
+
+
+# ===================== AGENT POOL =====================
+class AgentPool:
+    """Prebuilt Quiz Master agents for one endpoint, sharing a single LLM.
+
+    Agents are checked out per request so concurrent crews never share
+    executor state; only the topic-specific Task and Crew are built.
+    """
+
+    def __init__(self, base_url, api_key, size=QUIZ_LLM_MAX_CONCURRENCY):
+        self.base_url = base_url
+        self.size = size
+        self.llm = LLM(
+            model=QUIZ_MODEL,
+            api_key=api_key,
+            base_url=base_url,
+            timeout=QUIZ_LLM_READ_TIMEOUT,
+        )
+        self._idle = queue.LifoQueue()
+
+    def _build_agent(self):
+        return Agent(
+            role=AGENT_ROLE,
+            goal=AGENT_GOAL,
+            backstory=AGENT_BACKSTORY,
+            llm=self.llm
+        )
+
+    def run(self, description):
+        """Runs one quiz task and returns the raw response text."""
+        try:
+            agent = self._idle.get_nowait()
+        except queue.Empty:
+            agent = self._build_agent()
+
+        try:
+            task = Task(
+                description=description,
+                agent=agent,
+                expected_output=EXPECTED_OUTPUT
+            )
+            crew = Crew(
+                agents=[agent],
+                tasks=[task]
+            )
+            return crew.kickoff().raw
+        finally:
+            if self._idle.qsize() < self.size:
+                self._idle.put(agent)
+
+
+# ===================== QUIZ CLIENT =====================
+class QuizClient:
+    """Process-wide LLM client with optional hedging to a backup endpoint."""
+
+    def __init__(self):
+        _configure_http()
+
+        self.primary = AgentPool(
+            os.getenv("OPENAI_COMPATIBLE_ENDPOINT"),
+            os.getenv("Custom_OPENAI_API_KEY"),
+        )
+        backup_url = os.getenv("OPENAI_COMPATIBLE_ENDPOINT_BACKUP")
+        self.backup = AgentPool(
+            backup_url,
+            os.getenv("Custom_OPENAI_API_KEY_BACKUP")
+            or os.getenv("Custom_OPENAI_API_KEY"),
+        ) if backup_url else None
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=200)
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * QUIZ_LLM_MAX_CONCURRENCY,
+            thread_name_prefix="quiz-llm",
+        )
+
+        self.calls = 0
+        self.hedged = 0
+        self.backup_wins = 0
+
+    # ----- latency tracking -----
+    def _timed(self, description):
+        started = time.perf_counter()
+        text = self.primary.run(description)
+        with self._lock:
+            self._latencies.append(time.perf_counter() - started)
+        return text
+
+    def hedge_delay(self):
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < QUIZ_HEDGE_MIN_SAMPLES:
+            return QUIZ_HEDGE_DEFAULT_DELAY
+        index = min(len(samples) - 1, int(QUIZ_HEDGE_PERCENTILE * len(samples)))
+        return samples[index]
+
+    # ----- calls -----
+    def generate(self, description):
+        """Returns the raw LLM text for ``description``."""
+        with self._lock:
+            self.calls += 1
+
+        if self.backup is None:
+            return self._timed(description)
+
+        primary = self._executor.submit(self._timed, description)
+        done, _ = wait([primary], timeout=self.hedge_delay())
+        if done:
+            return primary.result()
+
+        # Primary is in its slow tail: race a backup call against it
+        with self._lock:
+            self.hedged += 1
+        backup = self._executor.submit(self.backup.run, description)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.backup_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "backup_wins": self.backup_wins,
+            "hedge_delay": self.hedge_delay(),
+        }
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_quiz_client():
+    """Returns the shared quiz client, building it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = QuizClient()
+                register_collector("llm", _client.stats)
+    return _client
@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import deque
+
+from common.metrics import register_collector
+
+# ===================== CONCURRENCY CONFIG =====================
+QUIZ_LLM_MAX_CONCURRENCY = int(os.getenv("QUIZ_LLM_MAX_CONCURRENCY", "4"))
+QUIZ_LLM_QUEUE_TIMEOUT = float(os.getenv("QUIZ_LLM_QUEUE_TIMEOUT", "120"))
+
+
+# ===================== FAIR LIMITER =====================
+class FairLimiter:
+    """Caps concurrent work; waiters are admitted strictly in arrival order."""
+
+    def __init__(self, limit=QUIZ_LLM_MAX_CONCURRENCY):
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+
+    def acquire(self, timeout=None):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return True
+            ticket = threading.Event()
+            self._waiters.append(ticket)
+
+        if ticket.wait(timeout):
+            return True
+
+        with self._lock:
+            # The slot may have been handed over right as the wait timed out
+            if ticket.is_set():
+                return True
+            self._waiters.remove(ticket)
+        return False
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the oldest waiter
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"active": self._active, "queued": len(self._waiters)}
+
+    def __enter__(self):
+        if not self.acquire(QUIZ_LLM_QUEUE_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free LLM slot")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# ===================== SINGLE FLIGHT =====================
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                flight.followers += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "calls": self.calls,
+                "shared": self.shared,
+            }
+
+
+# ===================== PROCESS-WIDE INSTANCES =====================
+llm_limiter = FairLimiter()
+quiz_flights = SingleFlight()
+register_collector("llm_limiter", llm_limiter.stats)
+register_collector("quiz_flights", quiz_flights.stats)
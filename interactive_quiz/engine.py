@@ -0,0 +1,51 @@
+class QuizEngine:
+    """Streamlit-free progress and scoring of a multiple-choice quiz.
+
+    ``questions`` may keep growing while the quiz runs (streaming mode);
+    the engine only ever looks at the question under the cursor. Whether
+    each answer was right is scored once and kept as one byte per
+    question in ``marks``.
+    """
+
+    __slots__ = ("questions", "current", "score", "answers", "marks")
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.restart()
+
+    def restart(self):
+        self.current = 0
+        self.score = 0
+        self.answers = []
+        self.marks = bytearray()
+
+    # ----- compact state (questions are stored separately, by set id) -----
+    def to_state(self):
+        return [self.current, self.score, list(self.answers)]
+
+    def load_state(self, state):
+        self.current, self.score, answers = state
+        self.answers = list(answers)
+        # Rescored once on restore; the snapshot stays as small as before
+        self.marks = bytearray(
+            option == q["answer"] for option, q in zip(self.answers, self.questions)
+        )
+
+    @property
+    def finished(self):
+        return self.current >= len(self.questions)
+
+    def current_question(self):
+        """The question awaiting an answer, or ``None`` if none is available."""
+        if self.current < len(self.questions):
+            return self.questions[self.current]
+        return None
+
+    def answer(self, option):
+        """Records ``option`` for the current question; returns whether it was right."""
+        correct = option == self.questions[self.current]["answer"]
+        self.answers.append(option)
+        self.marks.append(correct)
+        self.score += correct
+        self.current += 1
+        return correct
@@ -0,0 +1,108 @@
+import re
+import json
+import threading
+
+from common.metrics import register_collector
+from interactive_quiz.streaming import IncrementalArrayParser
+from interactive_quiz.validation import is_valid_question
+
+_FENCE = re.compile(r"```[a-zA-Z]*")
+_decoder = json.JSONDecoder()
+
+
+# ===================== TOLERANT EXTRACTION =====================
+def strip_fences(text):
+    """Removes markdown code fences around (or inside) the LLM output."""
+    return _FENCE.sub("", text or "")
+
+
+def _largest_array(text):
+    """Decodes every JSON array in ``text``; returns the richest in questions."""
+    best, best_valid = None, 0
+    start = text.find("[")
+    while start != -1:
+        try:
+            value, end = _decoder.raw_decode(text, start)
+        except ValueError:
+            start = text.find("[", start + 1)
+            continue
+        if isinstance(value, list):
+            valid = sum(1 for q in value if is_valid_question(q))
+            if valid > best_valid:
+                best, best_valid = value, valid
+        start = text.find("[", end)
+    return best
+
+
+def extract_questions(text):
+    """Returns the schema-valid questions recovered from raw LLM text.
+
+    Clean JSON arrays are parsed directly. Otherwise fences and prose are
+    stripped, the largest decodable array is used, and a truncated array
+    still yields its complete objects.
+    """
+    try:
+        parsed = json.loads(text)
+        strict_ok = isinstance(parsed, list)
+    except (TypeError, ValueError):
+        parsed, strict_ok = None, False
+
+    if not strict_ok:
+        cleaned = strip_fences(text)
+        parsed = _largest_array(cleaned)
+        if parsed is None:
+            parsed = IncrementalArrayParser().feed(cleaned)
+
+    questions = [q for q in parsed if is_valid_question(q)]
+    extraction_stats.record(strict_ok, questions, len(parsed) - len(questions))
+    return questions
+
+
+def estimate_tokens(questions):
+    """Rough token count (~4 characters per token) of serialized questions."""
+    return len(json.dumps(questions)) // 4
+
+
+# ===================== METRICS =====================
+class ExtractionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.parse_failures = 0
+        self.invalid_questions = 0
+        self.repaired = 0
+        self.retries = 0
+        self.tokens_saved = 0
+
+    def record(self, strict_ok, kept, dropped):
+        with self._lock:
+            self.responses += 1
+            self.invalid_questions += dropped
+            if not strict_ok:
+                self.parse_failures += 1
+            if kept and (not strict_ok or dropped):
+                # These questions would have been thrown away before
+                self.repaired += 1
+                self.tokens_saved += estimate_tokens(kept)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "parse_failures": self.parse_failures,
+                "parse_failure_rate": (
+                    self.parse_failures / self.responses if self.responses else 0.0
+                ),
+                "invalid_questions": self.invalid_questions,
+                "repaired": self.repaired,
+                "retries": self.retries,
+                "tokens_saved": self.tokens_saved,
+            }
+
+
+extraction_stats = ExtractionStats()
+register_collector("extraction", extraction_stats.stats)
@@ -0,0 +1,50 @@
+import os
+
+# ===================== MODEL =====================
+QUIZ_MODEL = os.getenv("QUIZ_MODEL", "openai/openai/gpt-oss-120b")
+
+# ===================== QUIZ LENGTH =====================
+QUIZ_QUESTIONS_PER_QUIZ = int(os.getenv("QUIZ_QUESTIONS_PER_QUIZ", "5"))
+# Quiz lengths players can pick, up to marathon quizzes of QUIZ_MAX_QUESTIONS
+QUIZ_MAX_QUESTIONS = int(os.getenv("QUIZ_MAX_QUESTIONS", "100"))
+QUIZ_LENGTHS = sorted(
+    {QUIZ_QUESTIONS_PER_QUIZ} | {n for n in (5, 10, 25, 50, 100) if n <= QUIZ_MAX_QUESTIONS}
+)
+
+# ===================== QUIZ MASTER PERSONA =====================
+AGENT_ROLE = "Quiz Master"
+AGENT_GOAL = "Generate high-quality multiple-choice questions in strict JSON"
+AGENT_BACKSTORY = (
+    "You are an expert educator who creates precise, factual, "
+    "and unambiguous quiz questions."
+)
+EXPECTED_OUTPUT = "A valid JSON array strictly matching the schema"
+
+
+# ===================== TASK PROMPT =====================
+def build_quiz_prompt(topic, count, avoid=()):
+    # Follow-up requests must not repeat questions we already kept
+    avoid_rules = "".join(
+        f"- Do NOT repeat this question: {text}\n" for text in avoid
+    )
+    return (
+        f"You are an expert educator.\n\n"
+        f"Generate EXACTLY {count} multiple-choice questions "
+        f"on the topic: '{topic}'.\n\n"
+        "STRICT RULES:\n"
+        "- Questions must be factual and unambiguous\n"
+        "- Only ONE option must be correct\n"
+        "- Avoid subjective or opinion-based questions\n"
+        "- Difficulty: intermediate to advanced\n"
+        "- Each option must be concise and distinct\n"
+        "- Every question must be distinct from the others\n"
+        f"{avoid_rules}\n"
+        "OUTPUT FORMAT (JSON ONLY — NO EXTRA TEXT):\n"
+        "[\n"
+        "  {\n"
+        "    \"question\": \"Clear question text\",\n"
+        "    \"options\": [\"Option A\", \"Option B\", \"Option C\"],\n"
+        "    \"answer\": \"Option A\"\n"
+        "  }\n"
+        "]"
+    )
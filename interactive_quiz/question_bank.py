@@ -0,0 +1,339 @@
+"""Offline question bank: an indexed corpus that serves quizzes without the LLM.
+
+Questions live in SQLite with an FTS5 index over their topic, tags and
+wording. Reads go through a read-only, memory-mapped connection, so a
+lookup is a few page reads from the OS page cache. Every validated set
+the LLM produces is added as it arrives, which grows the bank during the
+event. Import a corpus (JSON list or JSON Lines of question dicts carrying
+``topic`` and optional ``tags``) with:
+
+    python -m interactive_quiz.question_bank import corpus.jsonl
+    python -m interactive_quiz.question_bank import python.json --topic Python
+    python -m interactive_quiz.question_bank search "python basics"
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import difflib
+import argparse
+import pathlib
+import threading
+
+from common.sqlite import ProcessWide, connect
+from interactive_quiz.question_pool import _WORD, question_fingerprint
+from interactive_quiz.validation import is_valid_question, normalize_topic
+
+# ===================== QUESTION BANK CONFIG =====================
+QUIZ_BANK_PATH = os.getenv(
+    "QUIZ_BANK_PATH", os.path.join("data", "question_bank.sqlite3")
+)
+# "first": ask the bank before the LLM; "fallback": only when the LLM
+# fails or is unreachable; "off": never
+QUIZ_BANK_TIER = os.getenv("QUIZ_BANK_TIER", "fallback").lower()
+QUIZ_BANK_MMAP_BYTES = int(os.getenv("QUIZ_BANK_MMAP_BYTES", str(256 * 1024 * 1024)))
+# How alike a misspelt topic must be to a known one (difflib ratio)
+QUIZ_BANK_FUZZY = float(os.getenv("QUIZ_BANK_FUZZY", "0.75"))
+# Quizzes are sampled from the best count * SPREAD matches, for variety
+QUIZ_BANK_SPREAD = 3
+# Topics added by other worker processes are picked up this often
+QUIZ_BANK_TOPICS_TTL = float(os.getenv("QUIZ_BANK_TOPICS_TTL", "60"))
+
+
+def _fts_query(key):
+    """Every topic word somewhere in the row, and one in its topic or tags.
+
+    Words longer than two letters also match as prefixes; shorter ones
+    ("of", "c") are left out unless the topic has nothing else.
+    """
+    words = _WORD.findall(key)
+    terms = [f'"{w}"*' for w in words if len(w) > 2] or [f'"{w}"' for w in words]
+    if not terms:
+        return ""
+    return f'({" AND ".join(terms)}) AND {{topic_key tags}} : ({" OR ".join(terms)})'
+
+
+# ===================== QUESTION BANK =====================
+class QuestionBank:
+    """Topic-searchable corpus of validated questions.
+
+    A topic resolves in three steps, stopping once enough questions
+    turned up: its exact key, the closest known topic spellings, then
+    (unless the caller opts out) a full-text search over topics, tags and
+    question wording.
+    """
+
+    def __init__(self, path=QUIZ_BANK_PATH, mmap_bytes=QUIZ_BANK_MMAP_BYTES,
+                 fuzzy=QUIZ_BANK_FUZZY, topics_ttl=QUIZ_BANK_TOPICS_TTL):
+        self.path = path
+        self.fuzzy = fuzzy
+        self.topics_ttl = topics_ttl
+
+        self._lock = threading.Lock()      # guards the reader and the topic list
+        self._db_lock = threading.Lock()   # guards the writer
+        self._topics = []                  # known topic keys, for fuzzy matching
+        self._topics_at = 0.0              # when _topics was last read
+
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.search_hits = 0
+        self.misses = 0
+        self.added = 0
+        self.duplicates = 0
+
+        # A bank shipped on a read-only volume still serves; it just cannot grow
+        try:
+            self._writer = self._connect(path)
+        except sqlite3.OperationalError:
+            self._writer = None
+        self._reader = self._open_reader(path, mmap_bytes)
+        self._load_topics()
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS bank_questions ("
+            " id INTEGER PRIMARY KEY,"
+            " topic_key TEXT NOT NULL,"
+            " tags TEXT NOT NULL,"
+            " text TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " question TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " added_at REAL NOT NULL,"
+            " UNIQUE (topic_key, fingerprint))",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bank_fts USING fts5("
+            " topic_key, tags, text,"
+            " content='bank_questions', content_rowid='id',"
+            " tokenize='porter unicode61')",
+        )
+
+    @staticmethod
+    def _open_reader(path, mmap_bytes):
+        uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+        db = sqlite3.connect(uri, uri=True, timeout=5, check_same_thread=False)
+        db.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        return db
+
+    # ----- writes -----
+    def add(self, topic, questions, tags=(), source="llm"):
+        """Adds the valid, new questions of a set; returns how many were kept."""
+        if self._writer is None:
+            return 0
+
+        key = normalize_topic(topic)
+        tag_text = " ".join(normalize_topic(t) for t in tags)
+        now = time.time()
+        kept = duplicates = 0
+
+        with self._db_lock, self._writer:
+            for q in questions:
+                if not is_valid_question(q):
+                    continue
+                cursor = self._writer.execute(
+                    "INSERT OR IGNORE INTO bank_questions"
+                    " (topic_key, tags, text, fingerprint, question, source, added_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, tag_text, q["question"], question_fingerprint(q["question"]),
+                     json.dumps(q), source, now),
+                )
+                if cursor.rowcount == 0:
+                    duplicates += 1
+                    continue
+                self._writer.execute(
+                    "INSERT INTO bank_fts (rowid, topic_key, tags, text) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, key, tag_text, q["question"]),
+                )
+                kept += 1
+
+        with self._lock:
+            self.added += kept
+            self.duplicates += duplicates
+            if kept and key not in self._topics:
+                self._topics.append(key)
+        return kept
+
+    # ----- reads -----
+    def pick(self, topic, count, search=True):
+        """``count`` questions on (or near) ``topic``, or ``None`` if too few.
+
+        ``search=False`` stops after the fuzzy stage: a caller that can
+        still ask the LLM prefers that to a loosely related set.
+        """
+        key = normalize_topic(topic)
+        want = count * QUIZ_BANK_SPREAD
+
+        with self._lock:
+            found = self._by_topic(key, want)
+            stage = "hits"
+            if len(found) < count:
+                stage = "fuzzy_hits"
+                if time.monotonic() - self._topics_at > self.topics_ttl:
+                    self._load_topics()
+                for close in difflib.get_close_matches(
+                    key, self._topics, n=3, cutoff=self.fuzzy
+                ):
+                    if close != key:
+                        self._merge(found, self._by_topic(close, want))
+            if len(found) < count and search and _fts_query(key):
+                stage = "search_hits"
+                self._merge(found, self._search(key, want))
+
+            if len(found) < count:
+                self.misses += 1
+                return None
+            setattr(self, stage, getattr(self, stage) + 1)
+
+        chosen = random.sample(list(found.values())[:want], count)
+        return [json.loads(q) for q in chosen]
+
+    def search(self, topic, limit=10):
+        """(topic_key, question text) of the best full-text matches."""
+        with self._lock:
+            ids = list(self._search(normalize_topic(topic), limit))
+            if not ids:
+                return []
+            marks = ",".join("?" * len(ids))
+            rows = dict(
+                (qid, (key, text)) for qid, key, text in self._reader.execute(
+                    f"SELECT id, topic_key, text FROM bank_questions WHERE id IN ({marks})",
+                    ids,
+                )
+            )
+        return [rows[qid] for qid in ids if qid in rows]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "hits": self.hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "search_hits": self.search_hits,
+                "misses": self.misses,
+                "added": self.added,
+                "duplicates": self.duplicates,
+            }
+
+    # ----- internals (caller holds the lock) -----
+    def _load_topics(self):
+        self._topics = [
+            row[0] for row in self._reader.execute(
+                "SELECT DISTINCT topic_key FROM bank_questions"
+            )
+        ]
+        self._topics_at = time.monotonic()
+
+    @staticmethod
+    def _merge(found, more):
+        for qid, question in more.items():
+            found.setdefault(qid, question)
+
+    def _by_topic(self, key, limit):
+        rows = self._reader.execute(
+            "SELECT id, question FROM bank_questions WHERE topic_key = ?"
+            " ORDER BY random() LIMIT ?",
+            (key, limit),
+        )
+        return dict(rows)
+
+    def _search(self, key, limit):
+        query = _fts_query(key)
+        if not query:
+            return {}
+        # Topic and tag matches outrank a word in some question's wording
+        rows = self._reader.execute(
+            "SELECT q.id, q.question FROM bank_fts"
+            " JOIN bank_questions q ON q.id = bank_fts.rowid"
+            " WHERE bank_fts MATCH ?"
+            " ORDER BY bm25(bank_fts, 10.0, 5.0, 1.0) LIMIT ?",
+            (query, limit),
+        )
+        return dict(rows)
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_bank = ProcessWide("question_bank", QuestionBank)
+
+
+def get_question_bank():
+    """Returns the process-wide question bank, or ``None`` when it is off."""
+    if QUIZ_BANK_TIER == "off":
+        return None
+    return _bank.get()
+
+
+# ===================== CORPUS IMPORT =====================
+def _read_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        records = json.loads(text)
+    except ValueError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return records if isinstance(records, list) else [records]
+
+
+def import_corpus(bank, path, topic=None, tags=()):
+    """Adds every valid question of a corpus file; returns (kept, skipped)."""
+    groups = {}  # (topic, tags) -> questions, added in one transaction each
+    skipped = 0
+    for record in _read_corpus(path):
+        record_topic = topic or (record.get("topic") if isinstance(record, dict) else None)
+        if not record_topic or not is_valid_question(record):
+            skipped += 1
+            continue
+        record_tags = tuple(tags) + tuple(record.get("tags", ()))
+        groups.setdefault((record_topic, record_tags), []).append(
+            {k: record[k] for k in ("question", "options", "answer")}
+        )
+
+    kept = 0
+    for (record_topic, record_tags), questions in groups.items():
+        added = bank.add(record_topic, questions, tags=record_tags, source="import")
+        kept += added
+        skipped += len(questions) - added
+    return kept, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the offline question bank.")
+    parser.add_argument("--path", default=QUIZ_BANK_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("import", help="Add the questions of JSON/JSONL files")
+    load.add_argument("files", nargs="+")
+    load.add_argument("--topic", help="Topic for records that carry none")
+    load.add_argument("--tag", action="append", default=[], dest="tags")
+
+    find = commands.add_parser("search", help="Show the best matches for a topic")
+    find.add_argument("topic")
+    find.add_argument("--limit", type=int, default=10)
+
+    commands.add_parser("stats", help="Questions and topics in the bank")
+    args = parser.parse_args()
+
+    bank = QuestionBank(args.path)
+    if args.command == "import":
+        for path in args.files:
+            started = time.perf_counter()
+            kept, skipped = import_corpus(bank, path, args.topic, args.tags)
+            print(f"{path}: {kept} added, {skipped} skipped "
+                  f"({time.perf_counter() - started:.2f}s)")
+        if bank._writer is not None:
+            # Compact the index after a bulk load
+            with bank._db_lock, bank._writer:
+                bank._writer.execute("INSERT INTO bank_fts (bank_fts) VALUES ('optimize')")
+    elif args.command == "search":
+        for key, text in bank.search(args.topic, args.limit):
+            print(f"[{key}] {text}")
+    else:
+        total = bank._reader.execute("SELECT COUNT(*) FROM bank_questions").fetchone()[0]
+        print(json.dumps({"questions": total, "topics": len(bank._topics)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
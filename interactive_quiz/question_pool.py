@@ -0,0 +1,192 @@
+import os
+import re
+import json
+import random
+import hashlib
+import threading
+
+from common.sqlite import ProcessWide, connect
+from interactive_quiz.cache import QUIZ_CACHE_PATH
+from interactive_quiz.validation import normalize_topic, is_valid_question
+
+# ===================== POOL CONFIG =====================
+QUIZ_POOL_MODE = os.getenv("QUIZ_POOL_MODE", "0") == "1"
+QUIZ_POOL_BATCH = int(os.getenv("QUIZ_POOL_BATCH", "50"))
+QUIZ_NEAR_DUPLICATE = float(os.getenv("QUIZ_NEAR_DUPLICATE", "0.7"))
+
+_WORD = re.compile(r"\w+")
+
+
+# ===================== FINGERPRINTS =====================
+def question_fingerprint(text):
+    """Exact-duplicate key: hash of the case/punctuation-folded wording."""
+    words = _WORD.findall(text.casefold())
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()
+
+
+def question_shingles(text, size=2):
+    """Word shingles used to spot near-duplicate wording."""
+    words = _WORD.findall(text.casefold())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ===================== QUESTION POOL =====================
+class QuestionPool:
+    """Deduplicated, indexed store of questions per topic.
+
+    One large LLM batch fills a topic; each quiz then samples a subset of
+    question ids the session has not seen yet. When a topic runs short,
+    rows other worker processes stored since the last read are loaded.
+    """
+
+    def __init__(self, path=QUIZ_CACHE_PATH, near_duplicate=QUIZ_NEAR_DUPLICATE):
+        self.near_duplicate = near_duplicate
+
+        self._lock = threading.Lock()
+        self._questions = {}     # id -> question dict
+        self._by_topic = {}      # key -> list of ids
+        self._fingerprints = {}  # key -> set of fingerprints
+        self._shingles = {}      # key -> list of shingle sets
+
+        self.added = 0
+        self.duplicates = 0
+        self.reloads = 0
+        self._loaded_id = 0  # highest row id read from the database
+
+        self._db = self._connect(path) if path else None
+        self._load()
+
+    @staticmethod
+    def _connect(path):
+        return connect(
+            path,
+            "CREATE TABLE IF NOT EXISTS question_pool ("
+            " id INTEGER PRIMARY KEY,"
+            " topic_key TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " question TEXT NOT NULL,"
+            " UNIQUE (topic_key, fingerprint))",
+            "CREATE INDEX IF NOT EXISTS question_pool_topic"
+            " ON question_pool (topic_key, id)",
+        )
+
+    def _load(self):
+        """Indexes rows stored since the last load; returns how many were new."""
+        if self._db is None:
+            return 0
+        rows = self._db.execute(
+            "SELECT id, topic_key, question FROM question_pool WHERE id > ? ORDER BY id",
+            (self._loaded_id,),
+        ).fetchall()
+        new = 0
+        for qid, key, question in rows:
+            self._loaded_id = qid
+            if qid in self._questions:
+                continue  # Added by this process
+            self._index(qid, key, json.loads(question))
+            new += 1
+        return new
+
+    def _index(self, qid, key, question):
+        text = question["question"]
+        self._questions[qid] = question
+        self._by_topic.setdefault(key, []).append(qid)
+        self._fingerprints.setdefault(key, set()).add(question_fingerprint(text))
+        self._shingles.setdefault(key, []).append(question_shingles(text))
+
+    def _is_duplicate(self, key, text):
+        if question_fingerprint(text) in self._fingerprints.get(key, ()):
+            return True
+        shingles = question_shingles(text)
+        return any(
+            jaccard(shingles, seen) >= self.near_duplicate
+            for seen in self._shingles.get(key, ())
+        )
+
+    # ----- writes -----
+    def add_batch(self, topic, questions):
+        """Adds valid, non-duplicate questions; returns how many were kept."""
+        key = normalize_topic(topic)
+        kept = 0
+
+        with self._lock:
+            for q in questions:
+                if not is_valid_question(q):
+                    continue
+                if self._is_duplicate(key, q["question"]):
+                    self.duplicates += 1
+                    continue
+
+                fingerprint = question_fingerprint(q["question"])
+                if self._db is not None:
+                    cursor = self._db.execute(
+                        "INSERT OR IGNORE INTO question_pool"
+                        " (topic_key, fingerprint, question) VALUES (?, ?, ?)",
+                        (key, fingerprint, json.dumps(q)),
+                    )
+                    if cursor.rowcount == 0:
+                        # Another worker process stored it first
+                        self.duplicates += 1
+                        continue
+                    qid = cursor.lastrowid
+                else:
+                    qid = len(self._questions) + 1
+                self._index(qid, key, q)
+                kept += 1
+
+            if self._db is not None:
+                self._db.commit()
+            self.added += kept
+        return kept
+
+    # ----- reads -----
+    def size(self, topic):
+        with self._lock:
+            return len(self._by_topic.get(normalize_topic(topic), ()))
+
+    def unseen(self, topic, seen):
+        with self._lock:
+            ids = self._by_topic.get(normalize_topic(topic), ())
+            return [qid for qid in ids if qid not in seen]
+
+    def sample(self, topic, count, seen):
+        """Picks ``count`` question ids not in ``seen``; ``None`` if too few."""
+        unseen = self.unseen(topic, seen)
+        if len(unseen) < count:
+            with self._lock:
+                self.reloads += 1
+                new = self._load()
+            if new:
+                unseen = self.unseen(topic, seen)
+        if len(unseen) < count:
+            return None
+        ids = random.sample(unseen, count)
+        with self._lock:
+            return [(qid, self._questions[qid]) for qid in ids]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._by_topic),
+                "questions": len(self._questions),
+                "added": self.added,
+                "duplicates": self.duplicates,
+                "reloads": self.reloads,
+            }
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+_pool = ProcessWide("question_pool", QuestionPool)
+
+
+def get_question_pool():
+    """Returns the process-wide question pool, loading it on first use."""
+    return _pool.get()
@@ -1,34 +1,98 @@
 import os
-import json
+import time
+import threading
 import streamlit as st
 from dotenv import load_dotenv
 
-# ================== IMPORTANT ==================
-# Disable CrewAI telemetry (fixes SIGTERM issue)
-os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
-
-from crewai import Agent, Task, Crew
-from crewai.llm import LLM
-
 # ================== LOAD ENV ==================
+# Before the package imports below read their settings from the environment
 load_dotenv()
 
+from common.events import emit
+from common.leaderboard import get_leaderboard
+from common.metrics import span, timed
+from common.session import persist_session
+from common.ui import is_fragment_rerun, rerun_fragment
+from interactive_quiz.cache import get_quiz_cache
+from interactive_quiz.coalescing import llm_limiter, quiz_flights
+from interactive_quiz.engine import QuizEngine
+from interactive_quiz.extraction import extract_questions, extraction_stats
+from interactive_quiz.prompts import QUIZ_QUESTIONS_PER_QUIZ, build_quiz_prompt
+from interactive_quiz.question_bank import QUIZ_BANK_TIER, get_question_bank
+from interactive_quiz.question_pool import QUIZ_POOL_BATCH, get_question_pool
+from interactive_quiz.streaming import stream_questions
+from interactive_quiz.validation import normalize_topic
+from interactive_quiz.warm_pool import warm_pool
+
+# Follow-up calls allowed to fill in questions that failed validation
+QUIZ_REPAIR_RETRIES = int(os.getenv("QUIZ_REPAIR_RETRIES", "1"))
+
+# Streams in flight by topic key and length; later players join them
+_streams = {}
+_streams_lock = threading.Lock()
+
 # ===================== QUIZ CLASS =====================
 class InteractiveQuiz:
-    def __init__(self, questions):
-        self.questions = questions
-        self.current_question = 0
-        self.score = 0
-        self.feedback = None
-        self.user_answers = []
+    """Streamlit view over a headless QuizEngine."""
 
+    def __init__(self, questions, expected_total=None):
+        self.engine = QuizEngine(questions)
+        self.feedback = None
+        # Id of the question set in the shared quiz store, once persisted
+        self.set_id = None
+        # Whether this run of the quiz was recorded as completed
+        self.recorded = False
+        # Answer review rows, built once the quiz is finished
+        self._review = None
+
+        # Streaming mode: questions keep arriving from a background thread
+        self.expected_total = expected_total or len(questions)
+        self.loading = False
+        self.load_error = None
+        self._arrived = threading.Event()
+        # Quizzes of other players sharing this one's stream
+        self._followers = []
+
+    # ----- engine state, read-only for the view -----
+    @property
+    def questions(self):
+        return self.engine.questions
+
+    @property
+    def current_question(self):
+        return self.engine.current
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def user_answers(self):
+        return self.engine.answers
+
+    def play(self):
+        """Renders the running quiz as a fragment that reruns on its own."""
+        st.fragment(self.render_board)()
+
+    @timed("quiz.board")
+    def render_board(self):
+        self.display_score()
+        self.display_feedback()
+        self.display_question()
+        # Full runs are saved once, at the end of main.py
+        if is_fragment_rerun():
+            persist_session()
+
+    @timed("quiz.display_question")
     def display_question(self):
         if self.current_question < len(self.questions):
             q = self.questions[self.current_question]
 
+            total = self.expected_total if self.loading else len(self.questions)
             st.subheader(
-                f"Question {self.current_question + 1}/{len(self.questions)}"
+                f"Question {self.current_question + 1}/{total}"
             )
+            st.progress(self.current_question / total)
             st.write(q["question"])
 
             selected_option = st.radio(
@@ -39,20 +103,28 @@ class InteractiveQuiz:
 
             if st.button("Submit", key=f"submit_{self.current_question}"):
 
-                # Store user answer
-                self.user_answers.append(selected_option)
-
-                if selected_option == q["answer"]:
+                # Store and score the user answer
+                correct = self.engine.answer(selected_option)
+                emit("answer", index=self.current_question - 1, correct=correct)
+                if correct:
                     self.feedback = ("success", "Correct! 🎉")
-                    self.score += 1
                 else:
                     self.feedback = (
                         "error",
                         f"Wrong! Correct answer: {q['answer']}"
                     )
 
-                self.current_question += 1
-                st.rerun()
+                rerun_fragment()
+
+        elif self.loading:
+            # Block only until the next question lands, then rerun
+            with st.spinner("Next question is on its way..."):
+                self.wait_for_question()
+            rerun_fragment()
+
+        elif self.load_error and not self.questions:
+            st.error("Error generating quiz")
+            st.code(self.load_error)
 
         else:
             self.display_results()
@@ -70,7 +142,23 @@ class InteractiveQuiz:
         st.metric("Score", self.score)
 
     # ===================== FINAL RESULTS =====================
+    @timed("quiz.results")
     def display_results(self):
+        if not self.recorded:
+            self.recorded = True
+            emit("quiz_completed", score=self.score, total=len(self.questions))
+
+            # Only a set's first completion counts; a restart is practice
+            if self.set_id is None:
+                self.set_id = get_quiz_cache().store_set(list(self.questions))
+            scored = st.session_state.setdefault("quiz_scored", set())
+            if self.set_id not in scored:
+                scored.add(self.set_id)
+                get_leaderboard().submit(
+                    "quiz", st.session_state.get("player_name"),
+                    self.score, len(self.questions),
+                )
+
         st.subheader("🎉 Quiz Completed")
         st.write(
             f"### Final Score: **{self.score}/{len(self.questions)}**"
@@ -78,100 +166,327 @@ class InteractiveQuiz:
 
         st.divider()
         st.subheader("📋 Answer Review")
-
-        for idx, q in enumerate(self.questions):
-            user_ans = self.user_answers[idx]
-            correct = q["answer"]
-
-            st.markdown(f"**Q{idx+1}. {q['question']}**")
-
-            if user_ans == correct:
-                st.success(f"Your Answer: {user_ans} ✅")
-            else:
-                st.error(f"Your Answer: {user_ans} ❌")
-                st.info(f"Correct Answer: {correct}")
+        self.display_review()
 
         st.divider()
 
         if st.button("🔄 Restart Quiz"):
             self.restart()
-            st.rerun()
+            rerun_fragment()
+
+    def review_rows(self):
+        """One row per question, built from the engine's marks on first use."""
+        if self._review is None:
+            self._review = [
+                {
+                    "#": idx + 1,
+                    "Result": "✅" if correct else "❌",
+                    "Question": q["question"],
+                    "Your Answer": user_ans,
+                    "Correct Answer": q["answer"],
+                }
+                for idx, (q, user_ans, correct) in enumerate(
+                    zip(self.questions, self.user_answers, self.engine.marks)
+                )
+            ]
+        return self._review
+
+    def display_review(self):
+        """The whole review as one table, however long the quiz was."""
+        rows = self.review_rows()
+        if st.toggle("Show only my mistakes", key="quiz_review_mistakes"):
+            rows = [row for row, correct in zip(rows, self.engine.marks) if not correct]
+
+        st.dataframe(
+            rows,
+            column_config={
+                "#": st.column_config.NumberColumn("#", width="small"),
+                "Result": st.column_config.TextColumn("", width="small"),
+                "Question": st.column_config.TextColumn("Question", width="large"),
+            },
+            hide_index=True,
+        )
 
     def restart(self):
-        self.current_question = 0
-        self.score = 0
+        self.engine.restart()
         self.feedback = None
-        self.user_answers = []
+        self.recorded = False
+        self._review = None
+
+    # ===================== STREAMING MODE =====================
+    @classmethod
+    def streaming(cls, topic, count=QUIZ_QUESTIONS_PER_QUIZ):
+        """Starts a quiz that fills in while the LLM is still generating.
+
+        The first question is playable as soon as its JSON object closes;
+        the rest are appended by a background thread. A second player
+        asking for the same topic and length meanwhile shares that stream.
+        """
+        # The warm pool only holds default-length sets
+        pooled = warm_pool.take(topic) if count == QUIZ_QUESTIONS_PER_QUIZ else None
+        if pooled is not None:
+            emit("cache_hit", tier="warm_pool")
+            return cls(pooled)
+
+        cached = get_quiz_cache().get(topic, count)
+        if cached is not None:
+            emit("cache_hit", tier="cache")
+            return cls(cached)
+
+        if QUIZ_BANK_TIER == "first":
+            banked = cls._from_bank(topic, count, search=False)
+            if banked is not None:
+                return cls(banked)
+
+        # Players asking for the same set join the stream already in flight
+        key = f"{normalize_topic(topic)}#{count}"
+        with _streams_lock:
+            leader = _streams.get(key)
+            if leader is not None:
+                emit("cache_hit", tier="stream")
+                return leader._follow()
+            quiz = cls([], expected_total=count)
+            quiz.loading = True
+            _streams[key] = quiz
+
+        threading.Thread(
+            target=quiz._consume_stream, args=(topic, count, key), daemon=True
+        ).start()
+        return quiz
+
+    def _follow(self):
+        """A quiz over this stream's questions, for another player (lock held)."""
+        follower = InteractiveQuiz(self.questions, expected_total=self.expected_total)
+        follower.loading = True
+        self._followers.append(follower)
+        return follower
+
+    def _notify(self):
+        for quiz in [self] + self._followers:
+            quiz._arrived.set()
+
+    def _consume_stream(self, topic, count, key):
+        started = time.perf_counter()
+        try:
+            for q in stream_questions(topic, count):
+                self.questions.append(q)
+                self._notify()
+                if len(self.questions) >= count:
+                    break
+            # Like request_questions: re-request only what failed validation
+            for _ in range(QUIZ_REPAIR_RETRIES):
+                missing = count - len(self.questions)
+                if missing <= 0:
+                    break
+                extraction_stats.record_retry()
+                follow_up = InteractiveQuiz._kickoff(
+                    topic, missing, avoid=[q["question"] for q in self.questions]
+                )
+                self.questions.extend(extract_questions(follow_up)[:missing])
+                self._notify()
+        except Exception as e:
+            self.load_error = str(e)
+        finally:
+            streamed = len(self.questions)
+            if not streamed and QUIZ_BANK_TIER == "fallback":
+                # Nothing arrived from the LLM; play a banked set instead
+                banked = self._from_bank(topic, count)
+                if banked is not None:
+                    self.questions.extend(banked)
+                    self.load_error = None
+
+            # No one joins once the stream is closed
+            with _streams_lock:
+                del _streams[key]
+            for quiz in [self] + self._followers:
+                quiz.load_error = self.load_error
+                quiz.loading = False
+            self._notify()
+            self._followers = []
+
+        latency_ms = round((time.perf_counter() - started) * 1000)
+        if streamed:
+            emit("quiz_generated", source="stream", questions=streamed,
+                 latency_ms=latency_ms)
+        else:
+            emit("quiz_failed", source="stream", latency_ms=latency_ms)
+
+        # A complete streamed set is as good as a blocking one
+        if streamed == count:
+            get_quiz_cache().put(topic, count, list(self.questions))
+            InteractiveQuiz._add_to_bank(topic, self.questions)
+
+    def wait_for_question(self, timeout=30):
+        """Waits until the current question has arrived or loading ends."""
+        while self.loading and self.current_question >= len(self.questions):
+            self._arrived.clear()
+            # Re-check after clearing so an append in between is not missed
+            if self.current_question < len(self.questions) or not self.loading:
+                break
+            if not self._arrived.wait(timeout):
+                break
+
+    # ===================== POOL MODE =====================
+    @classmethod
+    def from_pool(cls, topic, seen, count=QUIZ_QUESTIONS_PER_QUIZ):
+        """Builds a quiz from pooled questions this session has not seen.
+
+        ``seen`` maps topic keys to the question ids already shown to the
+        player and is updated in place.
+        """
+        pool = get_question_pool()
+        key = normalize_topic(topic)
+        topic_seen = seen.setdefault(key, set())
+
+        picked = pool.sample(topic, count, topic_seen)
+        if picked is not None:
+            emit("cache_hit", tier="question_pool")
+        else:
+            # One large LLM batch refills the pool for many quizzes
+            try:
+                quiz_flights.do(
+                    "pool:" + key,
+                    lambda: pool.add_batch(
+                        topic,
+                        InteractiveQuiz.request_questions(
+                            topic, max(QUIZ_POOL_BATCH, count)
+                        ),
+                    ),
+                )
+            except Exception:
+                # Unreachable endpoint: whatever the pool and bank hold still serves
+                if QUIZ_BANK_TIER != "fallback":
+                    raise
+            picked = pool.sample(topic, count, topic_seen)
+
+        # Never replay questions the player has had; the bank may still serve
+        if not picked:
+            banked = cls._from_bank(topic, count) if QUIZ_BANK_TIER == "fallback" else None
+            return cls(banked) if banked is not None else None
+
+        topic_seen.update(qid for qid, _ in picked)
+        return cls([q for _, q in picked])
 
     # ===================== QUESTION GENERATION =====================
     @staticmethod
-    def generate_questions(topic):
-        llm = LLM(
-            model="openai/openai/gpt-oss-120b",
-            api_key=os.getenv("Custom_OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_COMPATIBLE_ENDPOINT"),
-        )
+    @timed("quiz.generate")
+    def generate_questions(topic, count=QUIZ_QUESTIONS_PER_QUIZ):
+        # Instant path: a pre-generated set from the warm pool (default length only)
+        pooled = warm_pool.take(topic) if count == QUIZ_QUESTIONS_PER_QUIZ else None
+        if pooled is not None:
+            emit("cache_hit", tier="warm_pool")
+            return pooled
+
+        # Serve repeated topics from the cache instead of the LLM
+        cache = get_quiz_cache()
+        cached = cache.get(topic, count)
+        if cached is not None:
+            emit("cache_hit", tier="cache")
+            return cached
+
+        # Zero-latency tier: the offline question bank, ahead of the LLM
+        if QUIZ_BANK_TIER == "first":
+            banked = InteractiveQuiz._from_bank(topic, count, search=False)
+            if banked is not None:
+                return banked
+
+        # Concurrent requests for an equivalent topic share one LLM call
+        try:
+            questions = quiz_flights.do(
+                f"{normalize_topic(topic)}#{count}",
+                lambda: InteractiveQuiz._generate_and_cache(topic, count),
+            )
+        except Exception:
+            # Slow or unreachable endpoint: the bank keeps the booth running
+            banked = (
+                InteractiveQuiz._from_bank(topic, count)
+                if QUIZ_BANK_TIER == "fallback" else None
+            )
+            if banked is None:
+                raise
+            return banked
 
-        agent = Agent(
-            role="Quiz Master",
-            goal="Generate high-quality multiple-choice questions in strict JSON",
-            backstory=(
-                "You are an expert educator who creates precise, factual, "
-                "and unambiguous quiz questions."
-            ),
-            llm=llm
-        )
+        if not questions and QUIZ_BANK_TIER == "fallback":
+            return InteractiveQuiz._from_bank(topic, count) or []
+        return list(questions)
 
-        task = Task(
-            description=(
-                f"You are an expert educator.\n\n"
-                f"Generate EXACTLY 5 multiple-choice questions "
-                f"on the topic: '{topic}'.\n\n"
-                "STRICT RULES:\n"
-                "- Questions must be factual and unambiguous\n"
-                "- Only ONE option must be correct\n"
-                "- Avoid subjective or opinion-based questions\n"
-                "- Difficulty: intermediate to advanced\n"
-                "- Each option must be concise and distinct\n\n"
-                "OUTPUT FORMAT (JSON ONLY — NO EXTRA TEXT):\n"
-                "[\n"
-                "  {\n"
-                "    \"question\": \"Clear question text\",\n"
-                "    \"options\": [\"Option A\", \"Option B\", \"Option C\"],\n"
-                "    \"answer\": \"Option A\"\n"
-                "  }\n"
-                "]"
-            ),
-            agent=agent,
-            expected_output="A valid JSON array strictly matching the schema"
-        )
+    @staticmethod
+    def _generate_and_cache(topic, count=QUIZ_QUESTIONS_PER_QUIZ):
+        # Another flight (or worker process) may have filled the cache meanwhile
+        cache = get_quiz_cache()
+        cached = cache.get(topic, count)
+        if cached is not None:
+            emit("cache_hit", tier="cache")
+            return cached
 
-        crew = Crew(
-            agents=[agent],
-            tasks=[task]
-        )
+        questions = InteractiveQuiz.request_questions(topic, count)
+
+        # Only complete, validated sets reach the cache
+        cache.put(topic, count, questions)
+        return questions
 
-        result = crew.kickoff()
+    @staticmethod
+    def request_questions(topic, count=QUIZ_QUESTIONS_PER_QUIZ):
+        """Returns up to ``count`` validated questions, or an empty list.
+
+        Valid questions are salvaged from imperfect output; only the
+        missing ones are re-requested in a smaller follow-up call. Runs on
+        scheduler and API threads too, so it never renders anything: the
+        Streamlit caller reports an empty result.
+        """
+        started = time.perf_counter()
+        output_text = InteractiveQuiz._kickoff(topic, count)
+        questions = extract_questions(output_text)
+
+        for _ in range(QUIZ_REPAIR_RETRIES):
+            missing = count - len(questions)
+            if missing <= 0:
+                break
+            extraction_stats.record_retry()
+            follow_up = InteractiveQuiz._kickoff(
+                topic, missing, avoid=[q["question"] for q in questions]
+            )
+            questions += extract_questions(follow_up)[:missing]
 
-        # Extract raw LLM text
-        output_text = result.raw
+        latency_ms = round((time.perf_counter() - started) * 1000)
+        if not questions:
+            emit("quiz_failed", source="llm", latency_ms=latency_ms)
+            return []
 
-        try:
-            parsed = json.loads(output_text)
+        emit("quiz_generated", source="llm", questions=min(len(questions), count),
+             latency_ms=latency_ms)
+        InteractiveQuiz._add_to_bank(topic, questions[:count])
+        return questions[:count]
 
-            # Basic validation
-            assert isinstance(parsed, list)
-            for q in parsed:
-                assert "question" in q
-                assert "options" in q
-                assert "answer" in q
-                assert q["answer"] in q["options"]
+    # ===================== OFFLINE QUESTION BANK =====================
+    @staticmethod
+    def _from_bank(topic, count=QUIZ_QUESTIONS_PER_QUIZ, search=True):
+        """A set for ``topic`` from the offline question bank, or ``None``.
+
+        Ahead of the LLM (``search=False``) only the topic and its close
+        spellings count; full-text matches are left for the fallback.
+        """
+        bank = get_question_bank()
+        questions = bank.pick(topic, count, search) if bank is not None else None
+        if questions is not None:
+            emit("cache_hit", tier="bank")
+        return questions
 
-            return parsed
+    @staticmethod
+    def _add_to_bank(topic, questions):
+        """Grows the bank with every validated LLM set."""
+        bank = get_question_bank()
+        if bank is not None:
+            bank.add(topic, questions)
 
-        except Exception:
-            st.error("❌ Failed to parse valid quiz data")
-            st.code(output_text)
-            return []
+    @staticmethod
+    def _kickoff(topic, count, avoid=()):
+        """One LLM round trip; returns the raw response text."""
+        # crewai/litellm load here, on the first real generation
+        from interactive_quiz.client import get_quiz_client
 
+        description = build_quiz_prompt(topic, count, avoid)
 
+        # Global cap on concurrent LLM calls, admitted in arrival order
+        with llm_limiter, span("llm.call"):
+            return get_quiz_client().generate(description)
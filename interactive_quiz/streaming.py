@@ -0,0 +1,128 @@
+import os
+import json
+
+from interactive_quiz.coalescing import llm_limiter
+from interactive_quiz.prompts import AGENT_BACKSTORY, QUIZ_MODEL, build_quiz_prompt
+from interactive_quiz.validation import is_valid_question
+
+# ===================== STREAMING CONFIG =====================
+QUIZ_STREAMING = os.getenv("QUIZ_STREAMING", "0") == "1"
+
+
+# ===================== INCREMENTAL PARSER =====================
+class IncrementalArrayParser:
+    """Pulls complete objects out of a JSON array that arrives in pieces.
+
+    Text before the opening ``[`` (prose, code fences) is skipped, and so
+    is a bracket that does not open an array of objects ("see [1]"). Each
+    top-level ``{...}`` is decoded as soon as its closing brace arrives,
+    so only the object in progress is ever buffered.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.invalid = 0
+        self._objects = 0  # top-level objects opened so far
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+
+    def feed(self, chunk):
+        """Consumes ``chunk`` and returns the objects it completed."""
+        completed = []
+        if self.finished:
+            return completed
+
+        for ch in chunk:
+            if not self.started:
+                self.started = ch == "["
+                continue
+
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                    self._objects += 1
+                elif not self._objects and not ch.isspace():
+                    # Not an array of objects after all; look for the next "["
+                    self.started = ch == "["
+                elif ch == "]":
+                    self.finished = True
+                    break
+                continue
+
+            self._buffer.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        completed.append(obj)
+
+        return completed
+
+    def _decode(self, text):
+        try:
+            return json.loads(text)
+        except ValueError:
+            self.invalid += 1
+            return None
+
+
+def iter_valid_questions(chunks):
+    """Yields each schema-valid question as soon as it closes in ``chunks``."""
+    parser = IncrementalArrayParser()
+    for chunk in chunks:
+        for q in parser.feed(chunk):
+            if is_valid_question(q):
+                yield q
+        if parser.finished:
+            return
+
+
+# ===================== LLM TOKEN STREAM =====================
+def stream_llm_text(topic, count):
+    """Yields raw text deltas from a streaming chat completion."""
+    import litellm
+    from interactive_quiz.client import QUIZ_LLM_READ_TIMEOUT, get_quiz_client
+
+    # Shares the client's keep-alive connection pool and timeouts
+    get_quiz_client()
+
+    with llm_limiter:
+        response = litellm.completion(
+            model=QUIZ_MODEL,
+            timeout=QUIZ_LLM_READ_TIMEOUT,
+            api_key=os.getenv("Custom_OPENAI_API_KEY"),
+            api_base=os.getenv("OPENAI_COMPATIBLE_ENDPOINT"),
+            messages=[
+                {"role": "system", "content": AGENT_BACKSTORY},
+                {"role": "user", "content": build_quiz_prompt(topic, count)},
+            ],
+            stream=True,
+        )
+        for chunk in response:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+def stream_questions(topic, count):
+    """Yields validated questions for ``topic`` while the LLM is still writing."""
+    return iter_valid_questions(stream_llm_text(topic, count))
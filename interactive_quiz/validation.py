@@ -0,0 +1,36 @@
+import re
+import unicodedata
+
+
+# ===================== TOPIC NORMALIZATION =====================
+# Keep "+" and "#" so that "C++" / "C#" do not collapse into "C".
+_PUNCTUATION = re.compile(r"[^\w\s+#]")
+
+
+def normalize_topic(topic):
+    """Folds case, whitespace and punctuation so equivalent topics share a key."""
+    text = unicodedata.normalize("NFKC", topic or "").casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+# ===================== QUESTION VALIDATION =====================
+def is_valid_question(q):
+    """True when a single question dict matches the quiz schema."""
+    if not isinstance(q, dict):
+        return False
+    if not isinstance(q.get("question"), str) or not q["question"].strip():
+        return False
+    options = q.get("options")
+    if not isinstance(options, list) or len(options) < 2:
+        return False
+    return q.get("answer") in options
+
+
+def validate_questions(parsed):
+    """True when the parsed LLM output is a non-empty list of valid questions."""
+    return (
+        isinstance(parsed, list)
+        and len(parsed) > 0
+        and all(is_valid_question(q) for q in parsed)
+    )
@@ -0,0 +1,180 @@
+import os
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime
+
+from common.metrics import register_collector
+from interactive_quiz.prompts import QUIZ_QUESTIONS_PER_QUIZ
+from interactive_quiz.validation import normalize_topic, validate_questions
+
+# ===================== WARM POOL CONFIG =====================
+QUIZ_HOT_TOPICS = [
+    t.strip() for t in os.getenv("QUIZ_HOT_TOPICS", "").split(",") if t.strip()
+]
+QUIZ_POOL_LOW_WATER = int(os.getenv("QUIZ_POOL_LOW_WATER", "2"))
+QUIZ_POOL_TARGET = int(os.getenv("QUIZ_POOL_TARGET", "5"))
+QUIZ_POOL_REFILL_SECONDS = int(os.getenv("QUIZ_POOL_REFILL_SECONDS", "60"))
+QUIZ_TRENDING_TOPICS = int(os.getenv("QUIZ_TRENDING_TOPICS", "5"))
+QUIZ_TRENDING_MIN_REQUESTS = int(os.getenv("QUIZ_TRENDING_MIN_REQUESTS", "3"))
+QUIZ_TRENDING_WINDOW = float(os.getenv("QUIZ_TRENDING_WINDOW", str(30 * 60)))
+
+
+# ===================== WARM POOL =====================
+class WarmPool:
+    """Pre-generated, validated question sets ready to hand out per topic.
+
+    Hot topics come from ``QUIZ_HOT_TOPICS`` plus whatever visitors asked
+    for most within the trending window. A background scheduler tops each
+    pool back up to ``target`` once it falls below ``low_water``. Only
+    complete sets of ``set_size`` questions are pooled, since they are
+    handed out for default-length quizzes.
+    """
+
+    def __init__(self, hot_topics=QUIZ_HOT_TOPICS, low_water=QUIZ_POOL_LOW_WATER,
+                 target=QUIZ_POOL_TARGET, set_size=QUIZ_QUESTIONS_PER_QUIZ):
+        self.hot_topics = list(hot_topics)
+        self.set_size = set_size
+        self.low_water = low_water
+        self.target = max(target, low_water)
+
+        self._lock = threading.Lock()
+        self._pools = {}   # key -> deque of question sets
+        self._labels = {}  # key -> topic text used for generation
+        self._requests = deque()  # (timestamp, key), oldest first
+
+        self._generate = None
+        self._scheduler = None
+        self._refilling = set()
+
+        self.served = 0
+        self.empty = 0
+        self.generated = 0
+
+        for topic in self.hot_topics:
+            self._labels.setdefault(normalize_topic(topic), topic)
+
+    # ----- hand-out -----
+    def take(self, topic):
+        """Pops a ready question set for ``topic`` or returns ``None``."""
+        key = normalize_topic(topic)
+        now = time.time()
+
+        with self._lock:
+            self._labels.setdefault(key, topic)
+            self._requests.append((now, key))
+            self._trim_requests(now)
+
+            pool = self._pools.get(key)
+            questions = pool.popleft() if pool else None
+            if questions is None:
+                self.empty += 1
+            else:
+                self.served += 1
+            low = len(pool or ()) < self.low_water
+
+        if low and key in self.hot_keys():
+            self._schedule_refill(key)
+        return questions
+
+    def add(self, topic, questions):
+        # A salvaged partial set (3 of 5) would be served as a full quiz
+        if len(questions or ()) != self.set_size or not validate_questions(questions):
+            return False
+        key = normalize_topic(topic)
+        with self._lock:
+            self._labels.setdefault(key, topic)
+            self._pools.setdefault(key, deque()).append(questions)
+        return True
+
+    def size(self, topic):
+        with self._lock:
+            return len(self._pools.get(normalize_topic(topic), ()))
+
+    # ----- popularity -----
+    def _trim_requests(self, now):
+        cutoff = now - QUIZ_TRENDING_WINDOW
+        while self._requests and self._requests[0][0] < cutoff:
+            self._requests.popleft()
+
+    def trending_keys(self):
+        with self._lock:
+            self._trim_requests(time.time())
+            counts = Counter(key for _, key in self._requests)
+        return [
+            key for key, n in counts.most_common(QUIZ_TRENDING_TOPICS)
+            if n >= QUIZ_TRENDING_MIN_REQUESTS
+        ]
+
+    def hot_keys(self):
+        keys = [normalize_topic(t) for t in self.hot_topics]
+        keys += [k for k in self.trending_keys() if k not in keys]
+        return keys
+
+    # ----- refilling -----
+    def refill(self, key):
+        """Generates sets for ``key`` until its pool reaches ``target``."""
+        with self._lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+            topic = self._labels.get(key, key)
+
+        try:
+            while self.size(topic) < self.target:
+                questions = self._generate(topic)
+                if not self.add(topic, questions):
+                    break  # Give up until the next scheduled pass
+                self.generated += 1
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
+
+    def refill_all(self):
+        for key in self.hot_keys():
+            if self.size(key) < self.low_water:
+                self.refill(key)
+
+    def _schedule_refill(self, key):
+        if self._scheduler is not None:
+            self._scheduler.add_job(self.refill, args=[key])
+
+    def start(self, generate):
+        """Starts the background scheduler; ``generate(topic)`` makes one set."""
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        self._generate = generate
+        self._scheduler = BackgroundScheduler(daemon=True)
+        self._scheduler.add_job(
+            self.refill_all,
+            "interval",
+            seconds=QUIZ_POOL_REFILL_SECONDS,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(),
+        )
+        self._scheduler.start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._pools),
+                "ready_sets": sum(len(p) for p in self._pools.values()),
+                "served": self.served,
+                "empty": self.empty,
+                "generated": self.generated,
+            }
+
+
+# ===================== PROCESS-WIDE INSTANCE =====================
+warm_pool = WarmPool()
+register_collector("warm_pool", warm_pool.stats)
+_start_lock = threading.Lock()
+
+
+def start_warm_pool(generate):
+    """Starts the process-wide warm pool scheduler exactly once."""
+    with _start_lock:
+        if warm_pool._scheduler is None:
+            warm_pool.start(generate)
+    return warm_pool
@@ -0,0 +1,30 @@
+import importlib
+import threading
+
+# Modules behind quiz generation that are too heavy to import at startup
+LLM_STACK_MODULES = ("interactive_quiz.client",)
+
+_started = False
+_lock = threading.Lock()
+
+
+def warm_llm_stack_in_background():
+    """Imports the crewai/litellm stack on a daemon thread, once per process.
+
+    The login page and the number game never wait for it; the first quiz
+    generation usually finds it already loaded.
+    """
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+
+    def _import_all():
+        for name in LLM_STACK_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass  # The real import on first use reports the error
+
+    threading.Thread(target=_import_all, name="llm-warmup", daemon=True).start()
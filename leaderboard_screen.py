@@ -0,0 +1,33 @@
+"""Big-screen festival leaderboard.
+
+    streamlit run leaderboard_screen.py
+
+Reads only the in-memory top K, so it can refresh every few seconds
+without touching the database.
+"""
+import os
+import streamlit as st
+
+from common.ui import render_leaderboard
+
+# ===================== APP CONFIG =====================
+st.set_page_config(
+    page_title="🏆 Food Fest Leaderboard",
+    page_icon="🏆",
+    layout="wide"
+)
+
+LEADERBOARD_SCREEN_REFRESH = float(os.getenv("LEADERBOARD_SCREEN_REFRESH", "5"))
+LEADERBOARD_SCREEN_ROWS = int(os.getenv("LEADERBOARD_SCREEN_ROWS", "10"))
+
+st.title("🏆 Food Fest Leaderboard")
+
+
+@st.fragment(run_every=LEADERBOARD_SCREEN_REFRESH)
+def board():
+    quiz, number = st.columns(2)
+    render_leaderboard(quiz, "quiz", "🧠 Quiz Champions", "Score", LEADERBOARD_SCREEN_ROWS)
+    render_leaderboard(number, "number", "🔢 Fewest Guesses", "Guesses", LEADERBOARD_SCREEN_ROWS)
+
+
+board()
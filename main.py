@@ -5,9 +5,19 @@ import streamlit as st
 # Disable CrewAI telemetry globally (prevents SIGTERM error)
 os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
 
+from common.admin import is_admin_request, render_admin_page
+from common.metrics import span, start_metrics_dump, start_span
+from common.session import persist_session, restore_session
+from common.ui import render_leaderboard
 from interactive_quiz.quiz import InteractiveQuiz
+from interactive_quiz.prompts import QUIZ_LENGTHS, QUIZ_QUESTIONS_PER_QUIZ
+from interactive_quiz.question_bank import get_question_bank
+from interactive_quiz.question_pool import QUIZ_POOL_MODE
+from interactive_quiz.streaming import QUIZ_STREAMING
+from interactive_quiz.warm_pool import start_warm_pool
+from interactive_quiz.warmup import warm_llm_stack_in_background
 from Guess_Number.guess_the_number import GuessTheNumber
-# from Memory_Matrix.memory_matrix import MemoryMatrix  # optional
+from Memory_Matrix.memory_matrix import MemoryMatrix
 
 # ===================== APP CONFIG =====================
 st.set_page_config(
@@ -18,41 +28,89 @@ st.set_page_config(
 
 # ===================== CONSTANTS =====================
 PASSWORD = "fest2025"
+QUIZ_PREWARM = os.getenv("QUIZ_PREWARM", "1") == "1"
+
+# ===================== INSTRUMENTATION =====================
+# Spans are no-ops unless FEST_PROFILE=1; stats are exported either way
+start_metrics_dump()
+full_run = start_span("rerun.full")
+
+# Hidden ops page: ?admin=<FEST_ADMIN_TOKEN>
+if is_admin_request():
+    render_admin_page()
+    st.stop()
 
 # ===================== SESSION STATE INIT =====================
 st.session_state.setdefault("authenticated", False)
 st.session_state.setdefault("active_game", None)
 st.session_state.setdefault("quiz", None)
 st.session_state.setdefault("number_game_instance", None)
+st.session_state.setdefault("matrix_game_instance", None)
+st.session_state.setdefault("quiz_seen", {})  # topic -> pooled question ids shown
+st.session_state.setdefault("quiz_scored", set())  # set ids already on the leaderboard
+st.session_state.setdefault("player_name", "")
+
+# Games in progress come back from the shared state store after a reload,
+# a restart, or a hop to another worker process (the login does not)
+restore_session()
 
 # ===================== AUTHENTICATION =====================
-if not st.session_state.authenticated:
-    st.title("🔒 Food Fest Games")
+with span("auth"):
+    if not st.session_state.authenticated:
+        st.title("🔒 Food Fest Games")
 
-    password = st.text_input("Enter Password", type="password")
+        password = st.text_input("Enter Password", type="password")
 
-    if st.button("Login"):
-        if password == PASSWORD:
-            st.session_state.authenticated = True
-            st.success("Access granted!")
-            st.rerun()
-        else:
-            st.error("Incorrect password")
+        if st.button("Login"):
+            if password == PASSWORD:
+                st.session_state.authenticated = True
+                st.success("Access granted!")
+                st.rerun()
+            else:
+                st.error("Incorrect password")
 
-    st.stop()
+        st.stop()
 
-# ===================== SIDEBAR =====================
-st.sidebar.title("🎮 Select a Game")
+# ===================== BACKGROUND WARM-UP =====================
+# The LLM stack is imported lazily; load it off the UI thread after login
+if QUIZ_PREWARM:
+    warm_llm_stack_in_background()
 
-if st.sidebar.button("🧠 Interactive Quiz"):
-    st.session_state.active_game = "quiz"
-    st.session_state.quiz = None
-    st.session_state.number_game_instance = None
+# ===================== BACKGROUND WARM POOL =====================
+# Keeps ready-made quizzes for hot topics (started once per process)
+start_warm_pool(InteractiveQuiz.request_questions)
 
-if st.sidebar.button("🔢 Guess the Hidden Number"):
-    st.session_state.active_game = "number"
-    st.session_state.quiz = None
-    st.session_state.number_game_instance = None
+# ===================== OFFLINE QUESTION BANK =====================
+# Opened (and memory-mapped) once per process, before the LLM is needed
+get_question_bank()
+
+# ===================== SIDEBAR =====================
+with span("sidebar"):
+    st.sidebar.title("🎮 Select a Game")
+
+    if st.sidebar.button("🧠 Interactive Quiz"):
+        st.session_state.active_game = "quiz"
+        st.session_state.quiz = None
+        st.session_state.number_game_instance = None
+        st.session_state.matrix_game_instance = None
+
+    if st.sidebar.button("🔢 Guess the Hidden Number"):
+        st.session_state.active_game = "number"
+        st.session_state.quiz = None
+        st.session_state.number_game_instance = None
+        st.session_state.matrix_game_instance = None
+
+    if st.sidebar.button("🧩 Memory Matrix"):
+        st.session_state.active_game = "matrix"
+        st.session_state.quiz = None
+        st.session_state.number_game_instance = None
+        st.session_state.matrix_game_instance = None
+
+    # ===================== LEADERBOARD =====================
+    st.sidebar.divider()
+    st.sidebar.text_input("🏷️ Your name for the leaderboard", key="player_name", max_chars=24)
+    render_leaderboard(st.sidebar, "quiz", "🏆 Quiz Champions", "Score")
+    render_leaderboard(st.sidebar, "number", "🏆 Fewest Guesses", "Guesses")
 
 # ===================== MAIN UI =====================
 st.title("🍔 Food Fest Games")
@@ -69,6 +127,11 @@ if st.session_state.active_game == "quiz":
             "Enter quiz topic",
             placeholder="e.g., Python, SQL, AI, Food Safety"
         )
+        count = st.select_slider(
+            "Number of questions",
+            options=QUIZ_LENGTHS,
+            value=QUIZ_QUESTIONS_PER_QUIZ,
+        )
 
         if st.button("🚀 Generate Quiz"):
             if not topic.strip():
@@ -76,10 +139,18 @@ if st.session_state.active_game == "quiz":
             else:
                 with st.spinner("Generating quiz questions..."):
                     try:
-                        questions = InteractiveQuiz.generate_questions(topic)
+                        if QUIZ_POOL_MODE:
+                            quiz = InteractiveQuiz.from_pool(
+                                topic, st.session_state.quiz_seen, count
+                            )
+                        elif QUIZ_STREAMING:
+                            quiz = InteractiveQuiz.streaming(topic, count)
+                        else:
+                            questions = InteractiveQuiz.generate_questions(topic, count)
+                            quiz = InteractiveQuiz(questions) if questions else None
 
-                        if questions:
-                            st.session_state.quiz = InteractiveQuiz(questions)
+                        if quiz:
+                            st.session_state.quiz = quiz
                             st.success("Quiz ready!")
                             st.rerun()
                         else:
@@ -91,10 +162,8 @@ if st.session_state.active_game == "quiz":
 
     # Quiz running / results view
     if st.session_state.quiz:
-        quiz = st.session_state.quiz
-        quiz.display_score()
-        quiz.display_feedback()
-        quiz.display_question()
+        with span("quiz.play"):
+            st.session_state.quiz.play()
 
 # ====================================================
 # ===================== NUMBER GAME ===================
@@ -109,10 +178,27 @@ elif st.session_state.active_game == "number":
             max_attempts=3
         )
 
-    st.session_state.number_game_instance.play()
+    with span("guess.play"):
+        st.session_state.number_game_instance.play()
+
+# ====================================================
+# ===================== MEMORY MATRIX =================
+# ====================================================
+elif st.session_state.active_game == "matrix":
+    st.header("🧩 Memory Matrix")
+
+    if st.session_state.matrix_game_instance is None:
+        st.session_state.matrix_game_instance = MemoryMatrix(size=3, max_attempts=3)
+
+    with span("matrix.play"):
+        st.session_state.matrix_game_instance.play()
 
 # ====================================================
 # ===================== DEFAULT =======================
 # ====================================================
 else:
     st.info("👈 Please select a game from the sidebar")
+
+# ===================== PERSIST STATE =====================
+persist_session()
+full_run.end()